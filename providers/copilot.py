@@ -17,8 +17,28 @@ import asyncio
 import httpx
 import base64
 from io import BytesIO
+import weakref
 from PIL import Image
 
+# Keep-alive AsyncClient per event loop, so async calls reuse pooled TLS connections
+# instead of a fresh client and handshake per request. Pooled connections are bound to
+# the loop that opened them, hence one client per loop rather than one global.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _ASYNC_CLIENTS[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=30.0),
+            limits=httpx.Limits(keepalive_expiry=30.0),
+        )
+    return client
+
+
 class CopilotLLM(BaseChatModel):
     model_name: str = "gpt-4.1"
     vision_model_name: str = "gpt-4.1"
@@ -360,47 +380,47 @@ class CopilotLLM(BaseChatModel):
             }
             payload = self._build_payload(messages)
             
-            async with httpx.AsyncClient(timeout=httpx.Timeout(120.0, connect=30.0)) as client:
-                try:
-                    response = await _do_post(client, f"{api_endpoint}/chat/completions", headers, payload)
-                except Exception as e:
-                    print(f"[COPILOT] Primary request failed after retries: {e}", flush=True)
-                    raise
+            client = _async_client()
+            try:
+                response = await _do_post(client, f"{api_endpoint}/chat/completions", headers, payload)
+            except Exception as e:
+                print(f"[COPILOT] Primary request failed after retries: {e}", flush=True)
+                raise
+            
+            if response.status_code == 400:
+                error_detail = response.text
+                print(f"[COPILOT] Async 400 error. Content: {error_detail[:500]}", flush=True)
+                print(f"[COPILOT] Retrying with gpt-4.1...", flush=True)
                 
-                if response.status_code == 400:
-                    error_detail = response.text
-                    print(f"[COPILOT] Async 400 error. Content: {error_detail[:500]}", flush=True)
-                    print(f"[COPILOT] Retrying with gpt-4.1...", flush=True)
-                    
-                    # Clean headers and payload for fallback
-                    headers_fb = headers.copy()
-                    if "Copilot-Vision-Request" in headers_fb:
-                        headers_fb.pop("Copilot-Vision-Request")
-                    
-                    payload_fb = payload.copy()
-                    if "messages" in payload_fb:
-                        cleaned_messages = []
-                        for msg in payload_fb["messages"]:
-                            content = msg.get("content")
-                            if isinstance(content, list):
-                                text_only = " ".join([item.get("text", "") for item in content if isinstance(item, dict) and item.get("type") == "text"])
-                                cleaned_messages.append({**msg, "content": text_only or "[Image removed for fallback]"})
-                            else:
-                                cleaned_messages.append(msg)
-                        payload_fb["messages"] = cleaned_messages
-                    
-                    payload_fb["model"] = "gpt-4.1" # Using official stable model
-                    
-                    retry_response = await _do_post(client, f"{api_endpoint}/chat/completions", headers_fb, payload_fb)
-                    
-                    if retry_response.status_code != 200:
-                        print(f"[COPILOT] Fallback failed. Status: {retry_response.status_code}, Body: {retry_response.text}", flush=True)
-                    retry_response.raise_for_status()
-                    return self._process_json_result(retry_response.json(), messages)
+                # Clean headers and payload for fallback
+                headers_fb = headers.copy()
+                if "Copilot-Vision-Request" in headers_fb:
+                    headers_fb.pop("Copilot-Vision-Request")
+                
+                payload_fb = payload.copy()
+                if "messages" in payload_fb:
+                    cleaned_messages = []
+                    for msg in payload_fb["messages"]:
+                        content = msg.get("content")
+                        if isinstance(content, list):
+                            text_only = " ".join([item.get("text", "") for item in content if isinstance(item, dict) and item.get("type") == "text"])
+                            cleaned_messages.append({**msg, "content": text_only or "[Image removed for fallback]"})
+                        else:
+                            cleaned_messages.append(msg)
+                    payload_fb["messages"] = cleaned_messages
+                
+                payload_fb["model"] = "gpt-4.1" # Using official stable model
+                
+                retry_response = await _do_post(client, f"{api_endpoint}/chat/completions", headers_fb, payload_fb)
                 
-                response.raise_for_status()
-                data = response.json()
+                if retry_response.status_code != 200:
+                    print(f"[COPILOT] Fallback failed. Status: {retry_response.status_code}, Body: {retry_response.text}", flush=True)
+                retry_response.raise_for_status()
+                return self._process_json_result(retry_response.json(), messages)
             
+            response.raise_for_status()
+            data = response.json()
+        
             return self._process_json_result(data, messages)
         except Exception as e:
             print(f"[LLM] Async generation failed: {e}")
@@ -1,54 +1,96 @@
-
 import asyncio
+import io
 import os
 import sys
+from collections import defaultdict
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.getcwd(), 'src')))
 
+from brain.config import ensure_dirs  # noqa: E402
+from brain.mcp_manager import mcp_manager  # noqa: E402
+from brain.script_utils import configured_servers, run  # noqa: E402
+
+
+# Per-server deadline covering connect + list_tools
+CHECK_TIMEOUT_S = float(os.getenv("MCP_HEALTH_TIMEOUT", "30"))
+# Tools counted per server; later tools/list pages are never requested
+MAX_TOOLS_COUNTED = 100
+
+
+async def check_server(mcp_manager, server_name, timeout=CHECK_TIMEOUT_S):
+    try:
+        # iter_tools will automatically call get_session and connect if needed;
+        # one deadline covers both, so a hung server can't stall the whole report
+        tools_count = 0
+        async with asyncio.timeout(timeout):
+            async for _ in mcp_manager.iter_tools(server_name, limit=MAX_TOOLS_COUNTED):
+                tools_count += 1
+        if tools_count:
+            return {
+                "status": "ONLINE",
+                "tools_count": tools_count
+            }
+        # check if it's connected
+        if server_name in mcp_manager.sessions:
+            return {
+                "status": "ONLINE (but no tools?)",
+                "tools_count": 0
+            }
+        return {
+            "status": "OFFLINE",
+            "error": "Failed to get session or tools"
+        }
+    except asyncio.TimeoutError:
+        return {
+            "status": "OFFLINE",
+            "error": f"Timed out after {timeout}s"
+        }
+    except Exception as e:
+        return {
+            "status": "OFFLINE",
+            "error": str(e)
+        }
+
+
 async def check_mcp():
-    from brain.mcp_manager import mcp_manager
-    from brain.config import ensure_dirs
-    
     ensure_dirs()
     # No .initialize() method exists on MCPManager
     
-    servers = mcp_manager.config.get("mcpServers", {})
+    server_names = configured_servers(mcp_manager, skip_disabled=True)
+
+    # Check all servers concurrently: total time is the slowest server, not the sum.
+    # Each server gets a progress line as soon as its check finishes.
+    async def named_check(name):
+        return name, await check_server(mcp_manager, name)
+
+    print(f"Checking {len(server_names)} MCP servers...", flush=True)
     results = {}
-    
-    for server_name in servers:
-        if server_name.startswith("_") or servers[server_name].get("disabled"):
-            continue
-        
-        try:
-            # list_tools will automatically call get_session and connect if needed
-            tools = await mcp_manager.list_tools(server_name)
-            if tools:
-                results[server_name] = {
-                    "status": "ONLINE",
-                    "tools_count": len(tools)
-                }
-            else:
-                # check if it's connected
-                if server_name in mcp_manager.sessions:
-                    results[server_name] = {
-                        "status": "ONLINE (but no tools?)",
-                        "tools_count": 0
-                    }
-                else:
-                    results[server_name] = {
-                        "status": "OFFLINE",
-                        "error": "Failed to get session or tools"
-                    }
-        except Exception as e:
-            results[server_name] = {
-                "status": "OFFLINE",
-                "error": str(e)
-            }
-    
-    print("MCP SERVER STATUS REPORT:")
+    for fut in asyncio.as_completed([named_check(name) for name in server_names]):
+        server_name, res = await fut
+        results[server_name] = res
+        print(f"  → {server_name}: {res['status']}", flush=True)
+
+    # Full report in name order once every check is done
+    results = {name: results[name] for name in server_names}
+
+    # Build the whole report first and emit it with a single write
+    buf = io.StringIO()
+    buf.write("MCP SERVER STATUS REPORT:\n")
+    # Per-status counts and the tool total are tallied in the same pass
+    by_status = defaultdict(list)
+    total_tools = 0
     for name, res in results.items():
-        print(f"[{name}] {res['status']} | {res.get('tools_count', '')} {res.get('error', '')}")
+        by_status[res["status"]].append(name)
+        total_tools += res.get("tools_count", 0)
+        count = res.get("tools_count", "")
+        if count == MAX_TOOLS_COUNTED:
+            count = f"{count}+"
+        buf.write(f"[{name}] {res['status']} | {count} {res.get('error', '')}\n")
+    counts = ", ".join(f"{status}: {len(names)}" for status, names in by_status.items())
+    buf.write(f"SUMMARY: {counts} | {total_tools} tools total\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
-    asyncio.run(check_mcp())
+    run(check_mcp())
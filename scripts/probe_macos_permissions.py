@@ -1,9 +1,9 @@
-import asyncio
 import os
 import sys
 
 sys.path.append(os.path.abspath(os.getcwd()))
 from src.brain.mcp_manager import mcp_manager  # noqa: E402
+from src.brain.script_utils import run  # noqa: E402
 
 
 async def probe():
@@ -16,6 +16,7 @@ async def probe():
             return
 
         print("✅ Connected to 'macos-use'. Fetching tools...")
+        # Always live: a probe must reflect the binary as currently built
         tools = await mcp_manager.list_tools("macos-use")
 
         print(f"\nFound {len(tools)} tools:")
@@ -30,4 +31,4 @@ async def probe():
 
 
 if __name__ == "__main__":
-    asyncio.run(probe())
+    run(probe())
@@ -10,13 +10,14 @@ AtlasTrinity Full Stack Development Setup Script
 - Перевірка системних сервісів (Docker, Redis, Postgres)
 """
 
+import functools
 import os
 import platform
 import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 
 # Кольори для консолі
@@ -209,15 +210,27 @@ def ensure_database():
         print_info("Переконайтесь, що PostgreSQL запущений і користувач 'dev' має права superuser.")
 
 
+@functools.lru_cache(maxsize=1)
+def _installed_formulas() -> FrozenSet[str]:
+    """All installed Homebrew formulas, from one `brew list` call (clear the cache after installs)."""
+    rc = subprocess.run(["brew", "list", "--formula", "-1"], capture_output=True, text=True)
+    return frozenset(rc.stdout.split()) if rc.returncode == 0 else frozenset()
+
+
+@functools.lru_cache(maxsize=1)
+def _installed_casks() -> FrozenSet[str]:
+    """All installed Homebrew casks, from one `brew list` call (clear the cache after installs)."""
+    rc = subprocess.run(["brew", "list", "--cask", "-1"], capture_output=True, text=True)
+    return frozenset(rc.stdout.split()) if rc.returncode == 0 else frozenset()
+
+
 def _brew_formula_installed(formula: str) -> bool:
-    rc = subprocess.run(["brew", "list", "--formula", formula], capture_output=True)
-    return rc.returncode == 0
+    return formula in _installed_formulas()
 
 
 def _brew_cask_installed(cask: str, app_name: str) -> bool:
     # 1) check brew metadata
-    rc = subprocess.run(["brew", "list", "--cask", cask], capture_output=True)
-    if rc.returncode == 0:
+    if cask in _installed_casks():
         return True
     # 2) check known application paths (user or /Applications)
     app_paths = [
@@ -253,10 +266,6 @@ def install_brew_deps():
     }
 
     # === Встановлення формул ===
-    def _brew_formula_installed(formula: str) -> bool:
-        rc = subprocess.run(["brew", "list", "--formula", formula], capture_output=True)
-        return rc.returncode == 0
-
     for formula, check_cmd in formulas.items():
         if shutil.which(check_cmd) or _brew_formula_installed(formula):
             print_success(f"{formula} вже встановлено")
@@ -264,26 +273,12 @@ def install_brew_deps():
             print_info(f"Встановлення {formula}...")
             try:
                 subprocess.run(["brew", "install", formula], check=True)
+                _installed_formulas.cache_clear()
                 print_success(f"{formula} встановлено")
             except subprocess.CalledProcessError as e:
                 print_error(f"Помилка встановлення {formula}: {e}")
 
     # === Встановлення casks ===
-    def _brew_cask_installed(cask: str, app_name: str) -> bool:
-        # 1) check brew metadata
-        rc = subprocess.run(["brew", "list", "--cask", cask], capture_output=True)
-        if rc.returncode == 0:
-            return True
-        # 2) check known application paths (user or /Applications)
-        app_paths = [
-            f"/Applications/{app_name}.app",
-            f"{os.path.expanduser('~/Applications')}/{app_name}.app",
-        ]
-        for p in app_paths:
-            if os.path.exists(p):
-                return True
-        return False
-
     for cask, app_name in casks.items():
         if _brew_cask_installed(cask, app_name):
             print_success(f"{cask} вже встановлено (виявлено локально)")
@@ -292,6 +287,7 @@ def install_brew_deps():
         print_info(f"Встановлення {cask}...")
         try:
             subprocess.run(["brew", "install", "--cask", cask], check=True)
+            _installed_casks.cache_clear()
             print_success(f"{cask} встановлено")
         except subprocess.CalledProcessError as e:
             # If install failed because an app already exists (user-installed), treat as installed
@@ -318,6 +314,7 @@ def install_brew_deps():
                 print_info(f"Формула {service} не встановлена — намагаємось встановити...")
                 try:
                     subprocess.run(["brew", "install", service], check=True)
+                    _installed_formulas.cache_clear()
                     print_success(f"{service} встановлено")
                 except subprocess.CalledProcessError as e:
                     print_warning(f"Не вдалося встановити {service}: {e}")
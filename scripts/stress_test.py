@@ -1,11 +1,17 @@
+import asyncio
 import json
+import os
 import sys
 import time
 
-import requests
+import httpx
 
-URL = "http://127.0.0.1:8000/api/chat"
-HEALTH_URL = "http://127.0.0.1:8000/api/health"
+BASE_URL = "http://127.0.0.1:8000"
+CHAT_PATH = "/api/chat"
+HEALTH_PATH = "/api/health"
+
+# Number of identical tasks fired at the server at once
+CONCURRENCY = int(os.getenv("STRESS_CONCURRENCY", "3"))
 
 TASK = """
 RESEARCH COMPLEXITY STRESS TEST:
@@ -16,33 +22,51 @@ RESEARCH COMPLEXITY STRESS TEST:
 """
 
 
-def wait_for_server():
+async def wait_for_server(client: httpx.AsyncClient, timeout_s: float = 120.0) -> bool:
     print("Waiting for server...")
-    for _ in range(120):  # 2 minutes wait
+    deadline = time.monotonic() + timeout_s  # 2 minutes wait
+    # Short backoff so readiness is noticed within ~250ms instead of up to 1s
+    delay = 0.025
+    while time.monotonic() < deadline:
         try:
-            resp = requests.get(HEALTH_URL)
+            resp = await client.get(HEALTH_PATH)
             if resp.status_code == 200:
                 print("\nServer is UP!")
                 return True
-        except requests.exceptions.ConnectionError:
-            time.sleep(1)
+        except httpx.TransportError:
             print(".", end="", flush=True)
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, 0.25)
     return False
 
 
-if __name__ == "__main__":
-    if not wait_for_server():
-        print("\nServer failed to start within timeout.")
-        sys.exit(1)
-
-    print(f"\nSending stress test task:\n{TASK}")
+async def run_task(client: httpx.AsyncClient, idx: int) -> None:
+    start = time.perf_counter()
     try:
-        resp = requests.post(URL, json={"request": TASK}, timeout=600)  # 10 min timeout for task
+        resp = await client.post(CHAT_PATH, json={"request": TASK}, timeout=600)  # 10 min per task
+        elapsed = time.perf_counter() - start
         if resp.status_code == 200:
-            print("\n✅ Task Completed Successfully!")
+            print(f"\n✅ [#{idx}] Task Completed Successfully in {elapsed:.2f}s")
             print(json.dumps(resp.json(), indent=2))
         else:
-            print(f"\n❌ Task Failed: {resp.status_code}")
+            print(f"\n❌ [#{idx}] Task Failed: {resp.status_code} after {elapsed:.2f}s")
             print(resp.text)
     except Exception as e:
-        print(f"\n❌ Request Exception: {e}")
+        print(f"\n❌ [#{idx}] Request Exception: {e}")
+
+
+async def main() -> int:
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        if not await wait_for_server(client):
+            print("\nServer failed to start within timeout.")
+            return 1
+
+        print(f"\nSending stress test task x{CONCURRENCY} concurrently:\n{TASK}")
+        start = time.perf_counter()
+        await asyncio.gather(*(run_task(client, i) for i in range(1, CONCURRENCY + 1)))
+        print(f"\nAll tasks finished in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
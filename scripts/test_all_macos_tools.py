@@ -1,5 +1,4 @@
 
-import asyncio
 import os
 import sys
 import json
@@ -11,6 +10,7 @@ sys.path.insert(0, str(project_root))
 
 from src.brain.mcp_manager import mcp_manager
 from src.brain.logger import logger
+from src.brain.script_utils import run
 
 async def test_tools():
     logger.info("🧪 Starting COMPREHENSIVE test of all macOS Native tools...")
@@ -111,4 +111,4 @@ async def test_tools():
         await mcp_manager.cleanup()
 
 if __name__ == "__main__":
-    asyncio.run(test_tools())
+    run(test_tools())
@@ -7,6 +7,27 @@ from pathlib import Path
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
+from src.brain.script_utils import run  # noqa: E402
+
+STDOUT_LIMIT = 1 << 24  # 16 MiB
+
+# JSON-RPC framing: orjson encodes straight to newline-terminated bytes and parses bytes
+# several times faster; stdlib json (one reused compact encoder) is the fallback
+try:
+    import orjson
+
+    def _dump_frame(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def _dump_frame(obj) -> bytes:
+        return (_encode(obj) + "\n").encode()
+
+    _loads = json.loads
+
 
 async def run_mcp_test():
     print("=== TESTING MACOS-USE SWIFT BINARY TOOLS ===")
@@ -31,257 +52,215 @@ async def run_mcp_test():
         binary_path,
         stdin=asyncio.subprocess.PIPE,
         stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
+        stderr=asyncio.subprocess.PIPE,
+        # A base64 screenshot is one JSON line far above the default 64 KiB readline limit
+        limit=STDOUT_LIMIT,
     )
     
     print("Server process started.")
 
-    async def read_response():
-        line = await process.stdout.readline()
-        if not line:
-            return None
-        return json.loads(line.decode())
+    loop = asyncio.get_running_loop()
+    # Request id -> future resolved with that id's response (None if the server exits first)
+    pending = {}
+
+    async def reader():
+        # Parse each line once and route responses by id; notifications are dropped
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    msg = _loads(line)  # straight from bytes, no decode() copy
+                except ValueError:
+                    continue
+                fut = pending.pop(msg.get("id"), None)
+                if fut is not None and not fut.done():
+                    fut.set_result(msg)
+        finally:
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_result(None)
+            pending.clear()
+
+    reader_task = asyncio.create_task(reader())
 
     async def send_request(req):
-        msg = json.dumps(req) + "\n"
-        process.stdin.write(msg.encode())
+        process.stdin.write(_dump_frame(req))
+        await process.stdin.drain()
+
+    async def send_batch(requests):
+        """Write (id, method, params) requests with one writelines() and a single drain.
+
+        Returns the futures for their responses, in order.
+        """
+        futs, frames = [], []
+        for req_id, method, params in requests:
+            fut = loop.create_future()
+            if reader_task.done():
+                fut.set_result(None)
+            else:
+                pending[req_id] = fut
+            req = {"jsonrpc": "2.0", "id": req_id, "method": method}
+            if params is not None:
+                req["params"] = params
+            frames.append(_dump_frame(req))
+            futs.append(fut)
+        process.stdin.writelines(frames)
         await process.stdin.drain()
+        return futs
+
+    async def call(req_id, method, params=None):
+        (fut,) = await send_batch([(req_id, method, params)])
+        return await fut
+
+    def tool(name, arguments):
+        return "tools/call", {"name": name, "arguments": arguments}
+
+    def call_tool(req_id, name, arguments):
+        return call(req_id, *tool(name, arguments))
 
     # 3. Initialize
     print("\n--- Sending Initialize ---")
-    await send_request({
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test-client", "version": "1.0"}
-        }
+    resp = await call(1, "initialize", {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "test-client", "version": "1.0"}
     })
-    
-    # Read init response
-    while True:
-        resp = await read_response()
-        if not resp: break
-        if resp.get("id") == 1:
-            print("Initialize Response Received")
-            break
+    if resp:
+        print("Initialize Response Received")
 
     await send_request({
         "jsonrpc": "2.0",
         "method": "notifications/initialized"
     })
 
+    # 4-7 and the scenario's first step don't depend on each other: send them together,
+    # then report in order. (Requests may only follow the initialize handshake.)
+    futs = await send_batch([
+        (2, "tools/list", None),
+        (3, *tool("execute_command", {"command": "echo 'MCP Test Success'"})),
+        (4, *tool("macos-use_take_screenshot", {})),
+        (5, *tool("macos-use_analyze_screen", {})),
+        (10, *tool("macos-use_open_application_and_traverse", {"identifier": "Calculator"})),
+    ])
+    tools_resp, exec_resp, shot_resp, vision_resp, open_resp = await asyncio.gather(*futs)
+
     # 4. List Tools
     print("\n--- Listing Tools ---")
-    await send_request({
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/list"
-    })
-    
     tools = []
-    while True:
-        resp = await read_response()
-        if not resp: break
-        if resp.get("id") == 2:
-            tools = resp["result"]["tools"]
-            print(f"Found {len(tools)} tools:")
-            for t in tools:
-                print(f" - {t['name']}")
-            break
+    if tools_resp:
+        tools = tools_resp["result"]["tools"]
+        print(f"Found {len(tools)} tools:")
+        for t in tools:
+            print(f" - {t['name']}")
 
     # 5. Test execute_command
     print("\n--- Testing execute_command ---")
-    await send_request({
-        "jsonrpc": "2.0",
-        "id": 3,
-        "method": "tools/call",
-        "params": {
-            "name": "execute_command",
-            "arguments": {"command": "echo 'MCP Test Success'"}
-        }
-    })
-    while True:
-        resp = await read_response()
-        if not resp: break
-        if resp.get("id") == 3:
-            content = resp["result"]["content"][0]["text"]
-            print(f"Result: {content.strip()}")
-            if "MCP Test Success" in content:
-                print("✅ execute_command PASSED")
-            else:
-                print("❌ execute_command FAILED")
-            break
+    resp = exec_resp
+    if resp:
+        content = resp["result"]["content"][0]["text"]
+        print(f"Result: {content.strip()}")
+        if "MCP Test Success" in content:
+            print("✅ execute_command PASSED")
+        else:
+            print("❌ execute_command FAILED")
 
     # 6. Test Screenshot
     print("\n--- Testing macos-use_take_screenshot ---")
-    await send_request({
-        "jsonrpc": "2.0",
-        "id": 4,
-        "method": "tools/call",
-        "params": {
-            "name": "macos-use_take_screenshot",
-            "arguments": {}
-        }
-    })
-    while True:
-        resp = await read_response()
-        if not resp: break
-        if resp.get("id") == 4:
-            if "error" in resp: # Should check isError or result error
-                print(f"❌ Screenshot FAILED (Expected if headless/no permission): {resp}")
-            elif resp.get("result", {}).get("isError"):
-                 print(f"❌ Screenshot FAILED (Tool Error): {resp['result']['content'][0]['text']}")
+    resp = shot_resp
+    if resp:
+        if "error" in resp: # Should check isError or result error
+            print(f"❌ Screenshot FAILED (Expected if headless/no permission): {resp}")
+        elif resp.get("result", {}).get("isError"):
+            print(f"❌ Screenshot FAILED (Tool Error): {resp['result']['content'][0]['text']}")
+        else:
+            content = resp["result"]["content"][0]["text"]
+            if len(content) > 100:
+                print(f"✅ Screenshot PASSED (Base64 length: {len(content)})")
             else:
-                content = resp["result"]["content"][0]["text"]
-                if len(content) > 100:
-                    print(f"✅ Screenshot PASSED (Base64 length: {len(content)})")
-                else:
-                    print(f"❌ Screenshot FAILED (Content too short): {content}")
-            break
+                print(f"❌ Screenshot FAILED (Content too short): {content}")
 
     # 7. Test Vision Analysis
     print("\n--- Testing macos-use_analyze_screen ---")
-    await send_request({
-        "jsonrpc": "2.0",
-        "id": 5,
-        "method": "tools/call",
-        "params": {
-            "name": "macos-use_analyze_screen",
-            "arguments": {}
-        }
-    })
-    while True:
-        resp = await read_response()
-        if not resp: break
-        if resp.get("id") == 5:
-            if resp.get("result", {}).get("isError"):
-                 print(f"❌ Vision FAILED (Tool Error): {resp['result']['content'][0]['text']}")
-            else:
-                content = resp["result"]["content"][0]["text"]
-                try:
-                    data = json.loads(content)
-                    print(f"✅ Vision Analysis PASSED (Found {len(data)} elements)")
-                except:
-                    print(f"❌ Vision FAILED (Invalid JSON): {content}")
-            break
+    resp = vision_resp
+    if resp:
+        if resp.get("result", {}).get("isError"):
+            print(f"❌ Vision FAILED (Tool Error): {resp['result']['content'][0]['text']}")
+        else:
+            content = resp["result"]["content"][0]["text"]
+            try:
+                data = _loads(content)
+                print(f"✅ Vision Analysis PASSED (Found {len(data)} elements)")
+            except:
+                print(f"❌ Vision FAILED (Invalid JSON): {content}")
 
-    # 8. SCENARIO: Calculator Automation
+    # 8. SCENARIO: Calculator Automation (each later step depends on the previous one)
     print("\n--- SCENARIO: Calculator Automation ---")
     
-    # A. Open Calculator
+    # A. Open Calculator (sent with the batch above)
     print("Step 1: Opening Calculator...")
-    await send_request({
-        "jsonrpc": "2.0",
-        "id": 10,
-        "method": "tools/call",
-        "params": {
-            "name": "macos-use_open_application_and_traverse",
-            "arguments": {"identifier": "Calculator"}
-        }
-    })
-    
+    resp = open_resp
+
     app_pid = None
-    while True:
-        resp = await read_response()
-        if not resp: break
-        if resp.get("id") == 10:
-            content = resp["result"]["content"][0]["text"]
-            try:
-                res_data = json.loads(content)
-                # Check for direct PID or nested in openResult
-                if "pid" in res_data:
-                    app_pid = res_data["pid"]
-                elif "openResult" in res_data and "pid" in res_data["openResult"]:
-                    app_pid = res_data["openResult"]["pid"]
-                
-                if app_pid:
-                    print(f"✅ Application Opened (PID: {app_pid})")
-                else:
-                    print(f"❌ Failed to open app (No PID found): {res_data}")
-            except:
-                print(f"❌ Invalid JSON response: {content}")
-            break
+    if resp:
+        content = resp["result"]["content"][0]["text"]
+        try:
+            res_data = _loads(content)
+            # Check for direct PID or nested in openResult
+            if "pid" in res_data:
+                app_pid = res_data["pid"]
+            elif "openResult" in res_data and "pid" in res_data["openResult"]:
+                app_pid = res_data["openResult"]["pid"]
+            
+            if app_pid:
+                print(f"✅ Application Opened (PID: {app_pid})")
+            else:
+                print(f"❌ Failed to open app (No PID found): {res_data}")
+        except:
+            print(f"❌ Invalid JSON response: {content}")
             
     if app_pid:
-        import time
         await asyncio.sleep(1) # Wait for animation
         
         # B. Type Calculation "5+5="
         print("Step 2: Typing '5+5='...")
-        await send_request({
-            "jsonrpc": "2.0",
-            "id": 11,
-            "method": "tools/call",
-            "params": {
-                "name": "macos-use_type_and_traverse",
-                "arguments": {"pid": app_pid, "text": "5+5="}
-            }
-        })
-        while True:
-            resp = await read_response()
-            if not resp: break
-            if resp.get("id") == 11:
-                print("✅ Typing command sent")
-                break
+        resp = await call_tool(11, "macos-use_type_and_traverse", {"pid": app_pid, "text": "5+5="})
+        if resp:
+            print("✅ Typing command sent")
         
-        asyncio.sleep(0.5)
+        await asyncio.sleep(0.5)
 
         # C. Take Screenshot Verification
         print("Step 3: Taking Screenshot for Verification...")
-        await send_request({
-            "jsonrpc": "2.0",
-            "id": 12,
-            "method": "tools/call",
-            "params": {
-                "name": "macos-use_take_screenshot",
-                "arguments": {}
-            }
-        })
-        while True:
-            resp = await read_response()
-            if not resp: break
-            if resp.get("id") == 12:
-                if not resp.get("result", {}).get("isError"):
-                    print("✅ Screenshot captured successfully")
-                    # Optionally save it
-                    # with open("test_calc_screen.png", "wb") as f:
-                    #     content = resp["result"]["content"][0]["text"]
-                    #     f.write(base64.b64decode(content))
-                else:
-                     print(f"❌ Screenshot failed (Check permissions!): {resp}")
-                break
+        resp = await call_tool(12, "macos-use_take_screenshot", {})
+        if resp:
+            if not resp.get("result", {}).get("isError"):
+                print("✅ Screenshot captured successfully")
+                # Optionally save it
+                # with open("test_calc_screen.png", "wb") as f:
+                #     content = resp["result"]["content"][0]["text"]
+                #     f.write(base64.b64decode(content))
+            else:
+                print(f"❌ Screenshot failed (Check permissions!): {resp}")
                 
         # D. Vision Analysis Check
         print("Step 4: Checking Resut with Vision OCR...")
-        await send_request({
-            "jsonrpc": "2.0",
-            "id": 13,
-            "method": "tools/call",
-            "params": {
-                "name": "macos-use_analyze_screen",
-                "arguments": {}
-            }
-        })
-        while True:
-            resp = await read_response()
-            if not resp: break
-            if resp.get("id") == 13:
-                 if not resp.get("result", {}).get("isError"):
-                    content = resp["result"]["content"][0]["text"]
-                    print(f"✅ OCR Results received: {content[:100]}...")
-                    if "10" in content:
-                        print("🎉 SUCCESS: Found result '10' in OCR data!")
-                    else:
-                        print("⚠️ Result '10' not explicitly found in OCR text (might be graphical).")
-                 else:
-                     print(f"❌ OCR failed: {resp}")
-                 break
+        resp = await call_tool(13, "macos-use_analyze_screen", {})
+        if resp:
+            if not resp.get("result", {}).get("isError"):
+                content = resp["result"]["content"][0]["text"]
+                print(f"✅ OCR Results received: {content[:100]}...")
+                if "10" in content:
+                    print("🎉 SUCCESS: Found result '10' in OCR data!")
+                else:
+                    print("⚠️ Result '10' not explicitly found in OCR text (might be graphical).")
+            else:
+                print(f"❌ OCR failed: {resp}")
 
     print("\nAll tests completed.")
     process.terminate()
+    await reader_task
 
 if __name__ == "__main__":
-    asyncio.run(run_mcp_test())
+    run(run_mcp_test())
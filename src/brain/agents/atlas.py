@@ -6,7 +6,10 @@ Voice: Dmytro (male)
 Model: GPT-4.1 / GPT-5 mini
 """
 
+import functools
+import json
 import os
+import re
 
 # Import provider
 # Robust path handling for both Dev and Production (Packaged)
@@ -28,6 +31,81 @@ for r in [root_dev, root_prod]:
 
 from providers.copilot import CopilotLLM  # noqa: E402
 
+# orjson decodes LLM replies several times faster; stdlib json is the fallback.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+# Conversational heuristics for analyze_request, built once at import rather than per call.
+# English words use word boundaries to avoid substring matches (e.g., "hi" in "history").
+_GREETING_WORDS = ("привіт", "здоров", "вітаю", "ghbdsn", "ghbdtn")
+_GREETING_EN_RE = re.compile(r"\b(?:hi|hello)\b")
+# How are you (Strict phrases only)
+# Avoid checking single particles like "ся" or "ти" which appear in normal text
+_HOW_ARE_YOU_PHRASES = (
+    "як справи",
+    "як ти",
+    "як ви",
+    "як воно",
+    "як ся маєш",
+    "що нового",
+    "rfr ltkf",
+)
+# Confirmations (Simple positive responses), matched against the whole request
+_CONFIRM_WORDS = frozenset(("так", "звісно", "ага", "ок", "добре", "зрозумів", "fu", "lf"))
+_CONTINUE_WORDS = frozenset(("так", "звісно", "ага", "ок", "добре"))
+_THANKS_WORDS = ("дякую", "спасибі", "дкю", "dfre.", "cgfcb,")
+_THANKS_EN_RE = re.compile(r"\bthanks\b")
+# Words that make a request look like a command when the intent LLM is unavailable
+_LIKELY_TASK_WORDS = ("відкрий", "запусти", "terminal", "python", "file", "код")
+
+
+@functools.lru_cache(maxsize=1024)
+def _conversational_kind(req_lower: str) -> Optional[str]:
+    """Classify small talk: "how_are_you", "greeting" (also thanks/confirmations) or None.
+
+    Cached per normalized request: short conversational phrases recur throughout a session.
+    """
+    # Whole-request set lookup first: the cheapest check, and it settles bare confirmations
+    if len(req_lower) < 2 or req_lower in _CONFIRM_WORDS:
+        return "greeting"
+    if any(phrase in req_lower for phrase in _HOW_ARE_YOU_PHRASES):
+        return "how_are_you"
+    if (
+        any(w in req_lower for w in _GREETING_WORDS)
+        or _GREETING_EN_RE.search(req_lower)
+        or any(w in req_lower for w in _THANKS_WORDS)
+        or _THANKS_EN_RE.search(req_lower)
+    ):
+        return "greeting"
+    return None
+
+
+# A JSON string literal (skipped whole, so braces inside it don't count) or a single brace.
+# The string alternative is unambiguous, so scanning stays linear with no backtracking.
+_JSON_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+
+
+def _balanced_objects(text: str, start: int):
+    """Yield (start, end) slices of each top-level balanced {...} group from `start` on."""
+    depth = 0
+    obj_start = start
+    for match in _JSON_TOKEN_RE.finditer(text, start):
+        token = match.group()
+        if token == "{":
+            if depth == 0:
+                obj_start = match.start()
+            depth += 1
+        elif token == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield obj_start, match.end()
+
+
 from ..config_loader import config  # noqa: E402
 from ..context import shared_context  # noqa: E402
 from ..logger import logger  # noqa: E402
@@ -36,7 +114,7 @@ from ..prompts import AgentPrompts  # noqa: E402
 from ..prompts.atlas_chat import generate_atlas_chat_prompt  # noqa: E402
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskPlan:
     """Execution plan structure"""
 
@@ -132,54 +210,13 @@ class Atlas:
         req_lower = user_request.lower().strip()
 
         # Comprehensive layout-agnostic and conversational heuristic
-        # logger.info(f"Chat keywords: {chat_keywords}") # Removed to fix F841
-
         # Optimized conversational detection - stricter rules to avoid false positives with tasks
-        import re  # noqa: E402
-
-        # Regex for word boundaries to avoid substring matches (e.g., "hi" in "history")
-        def has_word(text, word):
-            return re.search(r"\b" + re.escape(word) + r"\b", text) is not None
-
-        # Greetings
-        greeting_words = ["привіт", "здоров", "вітаю", "ghbdsn", "ghbdtn"]
-        is_greeting = (
-            any(w in req_lower for w in greeting_words)
-            or has_word(req_lower, "hi")
-            or has_word(req_lower, "hello")
-        )
-
-        # How are you (Strict phrases only)
-        # Avoid checking single particles like "ся" or "ти" which appear in normal text
-        how_are_you_phrases = [
-            "як справи",
-            "як ти",
-            "як ви",
-            "як воно",
-            "як ся маєш",
-            "що нового",
-            "rfr ltkf",
-        ]
-        is_how_are_you = any(phrase in req_lower for phrase in how_are_you_phrases)
-
-        # Confirmations (Simple positive responses)
-        confirm_words = ["так", "звісно", "ага", "ок", "добре", "зрозумів", "fu", "lf"]
-        is_confirm = any(req_lower == w for w in confirm_words)
-
-        # Thanks
-        thanks_words = ["дякую", "спасибі", "дкю", "dfre.", "cgfcb,"]
-        is_thanks = any(w in req_lower for w in thanks_words) or has_word(req_lower, "thanks")
-
-        # Check for simple greetings or casual match
-        if is_greeting or is_how_are_you or is_thanks or is_confirm or len(req_lower) < 2:
-            response_type = "greeting"
-            if is_how_are_you:
-                response_type = "how_are_you"
-
+        kind = _conversational_kind(req_lower)
+        if kind is not None:
             initial_response = "Привіт! Я на зв'язку."
-            if response_type == "how_are_you":
+            if kind == "how_are_you":
                 initial_response = "Привіт! У мене все чудово. Чим можу допомогти?"
-            elif req_lower in ["так", "звісно", "ага", "ок", "добре"]:
+            elif req_lower in _CONTINUE_WORDS:
                 initial_response = "Чудово! Продовжуємо."
 
             return {
@@ -190,38 +227,6 @@ class Atlas:
                 "initial_response": initial_response,
             }
 
-        # Check for software development keywords
-        dev_keywords_ua = [
-            "напиши код",
-            "створи програму",
-            "розроби",
-            "напрограмуй",
-            "скрипт",
-            "веб-сайт",
-            "апі",
-            "бекенд",
-            "фронтенд",
-            "додаток",
-        ]
-        dev_keywords_en = [
-            "create app",
-            "build",
-            "develop",
-            "code",
-            "implement",
-            "write script",
-            "api",
-            "website",
-            "frontend",
-            "backend",
-            "program",
-            "software",
-        ]
-
-        is_development = any(kw in req_lower for kw in dev_keywords_ua) or any(
-            kw in req_lower for kw in dev_keywords_en
-        )
-
         prompt = AgentPrompts.atlas_intent_classification_prompt(
             user_request, str(context or "None"), str(history or "None")
         )
@@ -236,10 +241,7 @@ class Atlas:
         except Exception as e:
             # If LLM fails (e.g. 400 error), default to chat for safety unless it looks very much like a command
             logger.error(f"Intent detection LLM failed: {e}")
-            is_likely_task = any(
-                cmd in req_lower
-                for cmd in ["відкрий", "запусти", "terminal", "python", "file", "код"]
-            )
+            is_likely_task = any(cmd in req_lower for cmd in _LIKELY_TASK_WORDS)
             return {
                 "intent": "task" if is_likely_task else "chat",
                 "reason": f"Помилка API ({e}). Автоматичне визначення.",
@@ -692,14 +694,18 @@ class Atlas:
 
     def _parse_response(self, content: str) -> Dict[str, Any]:
         """Parse JSON response from LLM"""
-        import json  # noqa: E402
-
-        try:
-            # Find JSON in response
-            start = content.find("{")
-            end = content.rfind("}") + 1
-            if start >= 0 and end > start:
-                return json.loads(content[start:end])
-        except json.JSONDecodeError:
-            pass
+        # Find JSON in response
+        start = content.find("{")
+        end = content.rfind("}") + 1
+        if start >= 0 and end > start:
+            try:
+                return _json_loads(content[start:end])
+            except json.JSONDecodeError:
+                pass
+            # Braces in the surrounding prose, or several objects: first balanced one that decodes
+            for obj_start, obj_end in _balanced_objects(content, start):
+                try:
+                    return _json_loads(content[obj_start:obj_end])
+                except json.JSONDecodeError:
+                    continue
         return {"raw": content}
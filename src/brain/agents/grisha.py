@@ -6,6 +6,7 @@ Voice: Mykyta (male)
 Model: GPT-4o (Vision)
 """
 
+import asyncio
 import base64
 import os
 
@@ -34,7 +35,7 @@ from ..logger import logger  # noqa: E402
 from ..prompts import AgentPrompts  # noqa: E402
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """Verification result"""
 
@@ -837,12 +838,6 @@ Timestamp: {timestamp}
         - Active application window focus (AppleScript).
         - Combined context+detail image for GPT-4o Vision.
         """
-        import subprocess  # noqa: E402
-        import tempfile  # noqa: E402
-        from datetime import datetime  # noqa: E402
-
-        from PIL import Image  # noqa: E402
-
         from ..config import SCREENSHOTS_DIR  # noqa: E402
         from ..mcp_manager import mcp_manager  # noqa: E402
 
@@ -865,19 +860,35 @@ Timestamp: {timestamp}
                            
                  if base64_img:
                       # Save to file for consistency with rest of pipeline
-                      os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
                       timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                       path = os.path.join(SCREENSHOTS_DIR, f"vision_mcp_{timestamp}.jpg")
-                      
-                      with open(path, "wb") as f:
-                          f.write(base64.b64decode(base64_img))
-                          
+                      # Decode + write off the event loop (images are several MB)
+                      await asyncio.to_thread(self._write_b64_image, path, base64_img)
+
                       logger.info(f"[GRISHA] Screenshot taken via MCP macos-use: {path}")
                       return path
         except Exception as e:
             logger.warning(f"[GRISHA] MCP screenshot failed, falling back to local Quartz: {e}")
 
-        # 2. Local Fallback (Quartz/Screencapture)
+        # 2. Local Fallback (Quartz/Screencapture) - blocking capture and PIL work,
+        # so it runs in a worker thread instead of stalling the event loop
+        return await asyncio.to_thread(self._capture_local_screenshot)
+
+    @staticmethod
+    def _write_b64_image(path: str, base64_img: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(base64.b64decode(base64_img))
+
+    def _capture_local_screenshot(self) -> str:
+        """Local screenshot via Quartz/screencapture (blocking; call from a thread)."""
+        import subprocess  # noqa: E402
+        import tempfile  # noqa: E402
+
+        from PIL import Image  # noqa: E402
+
+        from ..config import SCREENSHOTS_DIR  # noqa: E402
+
         try:
             Quartz = None
             quartz_available = False
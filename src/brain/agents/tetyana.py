@@ -35,7 +35,7 @@ from ..context import shared_context  # noqa: E402
 from ..prompts import AgentPrompts  # noqa: E402
 
 
-@dataclass
+@dataclass(slots=True)
 class StepResult:
     """Result of step execution"""
 
@@ -298,18 +298,26 @@ class Tetyana:
         from ..logger import logger  # noqa: E402
         from ..mcp_manager import mcp_manager  # noqa: E402
 
+        # Notes are preferred and memory is the fallback; query both in one batch so a
+        # notes miss doesn't cost a second round trip. Deliberate trade-off: the memory
+        # search now runs even when notes already have the report.
+        result, memory_result = await mcp_manager.call_tools_batch(
+            [
+                (
+                    "notes",
+                    "search_notes",
+                    {
+                        "category": "verification_report",
+                        "tags": [f"step_{step_id}"],
+                        "limit": 1,
+                    },
+                ),
+                ("memory", "search_nodes", {"query": f"grisha_rejection_step_{step_id}"}),
+            ]
+        )
+
         # Try notes first (faster)
         try:
-            result = await mcp_manager.call_tool(
-                "notes",
-                "search_notes",
-                {
-                    "category": "verification_report",
-                    "tags": [f"step_{step_id}"],
-                    "limit": 1,
-                },
-            )
-
             # Normalize notes search result to a plain dict when possible
             notes_result = None
             try:
@@ -376,9 +384,7 @@ class Tetyana:
 
         # Fallback to memory
         try:
-            result = await mcp_manager.call_tool(
-                "memory", "search_nodes", {"query": f"grisha_rejection_step_{step_id}"}
-            )
+            result = memory_result
 
             if result and hasattr(result, "content"):
                 for item in result.content:
@@ -42,8 +42,19 @@ MCP_DIR = CONFIG_ROOT / "mcp"
 WORKSPACE_DIR = CONFIG_ROOT / "workspace"
 
 
+# Set once ensure_dirs() has run in this process
+_dirs_ensured = False
+
+
 def ensure_dirs():
-    """Ensure all required data directories exist and set global workspace permissions"""
+    """Ensure all required data directories exist and set global workspace permissions.
+
+    Runs once per process (on import); later calls are no-ops.
+    """
+    global _dirs_ensured
+    if _dirs_ensured:
+        return
+
     for d in [
         CONFIG_ROOT,
         LOG_DIR,
@@ -52,19 +63,19 @@ def ensure_dirs():
         MODELS_DIR,
         WHISPER_DIR,
         MCP_DIR,
+        WORKSPACE_DIR,
     ]:
         d.mkdir(parents=True, exist_ok=True)
 
-    # Special handling for Workspace: Create and set 777 permissions
-    if not WORKSPACE_DIR.exists():
-        WORKSPACE_DIR.mkdir(parents=True, exist_ok=True)
-
+    # Special handling for Workspace: set 777 permissions
     try:
         # Set 777 permissions (rwxrwxrwx) to allow full access for all users/agents
         os.chmod(WORKSPACE_DIR, 0o777)
     except Exception as e:
         print(f"Warning: Failed to set 777 permissions on workspace: {e}")
 
+    _dirs_ensured = True
+
 
 # Initialize directories on import to ensure they exist for logger/agents
 ensure_dirs()
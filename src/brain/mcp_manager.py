@@ -1,11 +1,13 @@
 import asyncio
+import copy
 import json
 import os
 import shutil
 import sys
+import time
 from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 
 def _import_mcp_sdk():
@@ -25,10 +27,10 @@ def _import_mcp_sdk():
 
 # Import preflight utilities (uses npm under the hood for registry checks)
 try:
-    from .mcp_preflight import check_package_arg_for_tool  # noqa: E402
+    from .mcp_preflight import check_package_arg_for_tool_async  # noqa: E402
 except Exception:
     # Fallback: if preflight not available, define a permissive stub
-    def check_package_arg_for_tool(arg: str, tool_cmd: str = "npx") -> bool:  # type: ignore
+    async def check_package_arg_for_tool_async(arg: str, tool_cmd: str = "npx") -> bool:  # type: ignore
         return True
 
 
@@ -45,6 +47,13 @@ from .db.manager import db_manager  # noqa: E402
 from sqlalchemy import text  # noqa: E402
 
 
+# How long a complete get_mcp_catalog() result is reused (seconds)
+CATALOG_CACHE_TTL_S = 30.0
+
+# JSON-RPC "method not found" (server doesn't implement a health probe)
+_METHOD_NOT_FOUND = -32601
+
+
 class MCPManager:
     """
     Manages persistent connections to MCP servers.
@@ -58,14 +67,26 @@ class MCPManager:
         cancel scopes/task-groups are exited in the same task they were entered.
     """
 
-    def __init__(self):
+    def __init__(self, preloaded_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            preloaded_config: Raw MCP config (config.json contents) to use instead of
+                reading it from disk. It is copied, so one parsed config can seed many managers.
+        """
         self.sessions: Dict[str, ClientSession] = {}
         # Per-server connection tasks and control structures
         self._connection_tasks: Dict[str, asyncio.Task] = {}
         self._close_events: Dict[str, asyncio.Event] = {}
         self._session_futures: Dict[str, asyncio.Future] = {}
-        self.config = self._load_config()
+        # st_mtime_ns of the config.json behind self.config (None: missing or preloaded)
+        self._config_mtime_ns: Optional[int] = None
+        if preloaded_config is not None:
+            self.config = self._process_config(copy.deepcopy(preloaded_config))
+        else:
+            self.config = self._load_config()
         self._lock = asyncio.Lock()
+        # Per-server locks so connecting to one server doesn't block others
+        self._server_locks: Dict[str, asyncio.Lock] = {}
         # Controls for restart concurrency and retry/backoff
         # Limit number of concurrent restarts to avoid forking storms
         self._restart_semaphore = asyncio.Semaphore(4)
@@ -73,6 +94,21 @@ class MCPManager:
         self._restart_backoff_base = float(
             config.get("mcp_enhanced.restart_backoff_base", 0.5)
         )  # seconds
+        # Ordered health probes: "ping" (tiny RPC), "list_tools" (full schemas), "skip"
+        raw_methods = os.getenv("TRINITY_HEALTH_CHECK_METHODS") or config.get(
+            "mcp_enhanced.health_check_methods", "ping,list_tools"
+        )
+        self._health_check_methods = [m.strip() for m in str(raw_methods).split(",") if m.strip()]
+        # Bounds concurrent health probes in health_check_loop
+        self._health_semaphore = asyncio.Semaphore(
+            int(config.get("mcp_enhanced.health_check_concurrency", 8))
+        )
+        # list_tools results per server, tagged with the session they came from
+        self._tools_cache: Dict[str, tuple] = {}
+        # (built_at, connected servers, text) of the last complete get_mcp_catalog()
+        self._catalog_cache: Optional[tuple] = None
+        # Which probe last succeeded per server (diagnostics)
+        self.health_check_method_used: Dict[str, str] = {}
 
     def _load_config(self) -> Dict[str, Any]:
         """Load MCP config from the global user config folder."""
@@ -80,8 +116,10 @@ class MCPManager:
             config_path = MCP_DIR / "config.json"
             if config_path.exists():
                 logger.info(f"Loading MCP config from: {config_path}")
+                mtime_ns = config_path.stat().st_mtime_ns
                 with open(config_path, "r", encoding="utf-8") as f:
                     raw_config = json.load(f)
+                self._config_mtime_ns = mtime_ns
                 return self._process_config(raw_config)
 
             logger.warning(f"MCP Config not found at: {config_path}")
@@ -90,6 +128,21 @@ class MCPManager:
             logger.error(f"Failed to load MCP config: {e}")
             return {}
 
+    def reload_config_if_changed(self) -> bool:
+        """Re-read config.json only if it changed on disk since it was loaded.
+
+        Returns True when the config was reloaded. Existing sessions are kept.
+        """
+        try:
+            mtime_ns = (MCP_DIR / "config.json").stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None and mtime_ns == self._config_mtime_ns:
+            return False
+        self.config = self._load_config()
+        self._catalog_cache = None
+        return True
+
     def _process_config(self, raw_config: Dict[str, Any]) -> Dict[str, Any]:
         """Filter disabled servers and substitute environment variables"""
         processed = {
@@ -189,13 +242,21 @@ class MCPManager:
 
         return processed
 
+    def _server_lock(self, server_name: str) -> asyncio.Lock:
+        """Return the lock serializing connection setup/teardown for one server"""
+        lock = self._server_locks.get(server_name)
+        if lock is None:
+            lock = self._server_locks[server_name] = asyncio.Lock()
+        return lock
+
     async def get_session(self, server_name: str) -> Optional[ClientSession]:
         """Get or create a persistent session for the server"""
         if ClientSession is None or StdioServerParameters is None or stdio_client is None:
             logger.error("MCP Python package is not installed; MCP features are unavailable")
             return None
 
-        async with self._lock:
+        # Only same-server callers wait on each other; different servers connect in parallel
+        async with self._server_lock(server_name):
             if server_name in self.sessions:
                 return self.sessions[server_name]
 
@@ -254,7 +315,9 @@ class MCPManager:
             # === PRE-FLIGHT: verify package versions for npx/bunx invocations ===
             # If the first arg looks like 'package@version', ensure the version exists
             # in the registry before spawning the external command.
-            if len(args) > 0 and not check_package_arg_for_tool(args[0], tool_cmd=command):
+            if len(args) > 0 and not await check_package_arg_for_tool_async(
+                args[0], tool_cmd=command
+            ):
                 logger.error(
                     f"Requested package '{args[0]}' for command '{command}' does not exist or version not available in registry. Aborting start for this MCP."
                 )
@@ -283,8 +346,14 @@ class MCPManager:
             if fut is None:
                 return None
             try:
-                session = await asyncio.wait_for(fut, timeout=connect_timeout)
+                # shield: timing out here must not cancel the future other callers share
+                session = await asyncio.wait_for(asyncio.shield(fut), timeout=connect_timeout)
                 return session
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise  # this caller was cancelled
+                logger.error(f"Existing connection for {server_name} was abandoned before init")
+                return None
             except Exception as e:
                 logger.error(f"Existing connection for {server_name} failed to initialize: {e}")
                 return None
@@ -329,12 +398,18 @@ class MCPManager:
         self._session_futures[server_name] = session_future
 
         try:
-            session = await asyncio.wait_for(session_future, timeout=connect_timeout)
+            # shield: if this caller is cancelled (eg. a short wait_for around a cold
+            # start) the runner keeps connecting in the background for later callers
+            session = await asyncio.wait_for(
+                asyncio.shield(session_future), timeout=connect_timeout
+            )
             return session
         except Exception as e:
             # If we couldn't initialize, ask runner to exit and await it
             logger.error(f"Failed to connect to {server_name}: {type(e).__name__}: {e}")
             logger.debug(f"[MCP] Command: {command}, Args: {args}, Env keys: {list(env.keys())}")
+            # Joiners still waiting on this connect report it as failed
+            session_future.cancel()
             try:
                 close_event.set()
                 await task
@@ -383,7 +458,7 @@ class MCPManager:
             # If connection died, try to reconnect once
             if "Connection closed" in str(e) or "Broken pipe" in str(e):
                 logger.warning(f"Connection lost to {server_name}, attempting reconnection...")
-                async with self._lock:
+                async with self._server_lock(server_name):
                     if server_name in self.sessions:
                         del self.sessions[server_name]
 
@@ -396,15 +471,39 @@ class MCPManager:
 
             return {"error": str(e)}
 
-    async def list_tools(self, server_name: str) -> List[Any]:
-        """List available tools for a server"""
+    async def call_tools_batch(
+        self, calls: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> List[Any]:
+        """Issue several (server, tool, arguments) calls at once; results keep call order.
+
+        Calls to one server share its stdio session (the MCP client matches responses by
+        JSON-RPC id), so a batch costs about one round trip instead of one per call.
+        Failures come back as {"error": ...}, as from call_tool.
+        """
+        results = await asyncio.gather(
+            *(self.call_tool(server, tool, args) for server, tool, args in calls),
+            return_exceptions=True,
+        )
+        return [{"error": str(r)} if isinstance(r, Exception) else r for r in results]
+
+    async def list_tools(self, server_name: str, refresh: bool = False) -> List[Any]:
+        """List available tools for a server.
+
+        Results are cached per live session; a reconnect (new session object) or
+        refresh=True fetches them again.
+        """
         session = await self.get_session(server_name)
         if not session:
             logger.warning(f"[MCP] Could not get session for {server_name}")
             return []
 
+        cached = self._tools_cache.get(server_name)
+        if not refresh and cached is not None and cached[0] is session:
+            return list(cached[1])
+
         try:
             result = await session.list_tools()
+            self._tools_cache[server_name] = (session, result.tools)
             return result.tools
         except Exception as e:
             logger.error(
@@ -413,6 +512,60 @@ class MCPManager:
             )
             return []
 
+    async def iter_tools(
+        self, server_name: str, limit: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """Yield a server's tools page by page, following the tools/list cursor.
+
+        Stops after `limit` tools; later pages are only requested once the caller
+        gets that far. Served from the list_tools() cache when it is current, and
+        a full enumeration fills that cache.
+        """
+        if limit is not None and limit <= 0:
+            return
+        session = await self.get_session(server_name)
+        if not session:
+            logger.warning(f"[MCP] Could not get session for {server_name}")
+            return
+
+        cached = self._tools_cache.get(server_name)
+        if cached is not None and cached[0] is session:
+            for tool in cached[1][:limit]:
+                yield tool
+            return
+
+        seen: List[Any] = []
+        cursor = None
+        try:
+            while True:
+                result = await session.list_tools(cursor)
+                for tool in result.tools:
+                    seen.append(tool)
+                    yield tool
+                    if len(seen) == limit:
+                        return
+                cursor = getattr(result, "nextCursor", None)
+                if not cursor:
+                    break
+        except Exception as e:
+            logger.error(
+                f"Error listing tools for {server_name}: {type(e).__name__}: {e}",
+                exc_info=True,
+            )
+            return
+        self._tools_cache[server_name] = (session, seen)
+
+    def cached_tools(self, server_name: str) -> Optional[List[Any]]:
+        """Tools from the last list_tools() on the server's current session, or None.
+
+        Never connects or issues an RPC.
+        """
+        cached = self._tools_cache.get(server_name)
+        session = self.sessions.get(server_name)
+        if cached is None or session is None or cached[0] is not session:
+            return None
+        return list(cached[1])
+
     async def health_check(self, server_name: str) -> bool:
         """
         Check if a server is healthy.
@@ -423,9 +576,27 @@ class MCPManager:
             return False
 
         try:
-            # Try to list tools as a health check
-            await session.list_tools()
-            return True
+            # Cheapest probe first; fall through only when the server doesn't support it
+            for method in self._health_check_methods:
+                if method == "skip":
+                    self.health_check_method_used[server_name] = method
+                    return True
+                try:
+                    if method == "ping":
+                        await session.send_ping()
+                    elif method == "list_tools":
+                        await session.list_tools()
+                    else:
+                        continue
+                except AttributeError:
+                    continue
+                except Exception as e:
+                    if getattr(getattr(e, "error", None), "code", None) == _METHOD_NOT_FOUND:
+                        continue
+                    raise
+                self.health_check_method_used[server_name] = method
+                return True
+            return False
         except Exception as e:
             # Special handling for vibe server - try to auto-enable on errors
             if server_name == "vibe":
@@ -467,6 +638,7 @@ class MCPManager:
                 # Remove any remaining session reference
                 if server_name in self.sessions:
                     del self.sessions[server_name]
+                self._tools_cache.pop(server_name, None)
 
             server_config = self.config.get("mcpServers", {}).get(server_name)
             # Treat an empty dict as a valid server configuration. Only fail if the entry is missing entirely.
@@ -512,6 +684,19 @@ class MCPManager:
             )
             return False
 
+    async def _check_and_restart(self, server_name: str) -> None:
+        """Health-check one server and restart it if unhealthy."""
+        async with self._health_semaphore:
+            is_healthy = await self.health_check(server_name)
+
+        if not is_healthy:
+            logger.warning(f"[MCP] Server {server_name} unhealthy, restarting...")
+            success = await self.restart_server(server_name)
+            if success:
+                logger.info(f"[MCP] Server {server_name} restarted successfully")
+            else:
+                logger.error(f"[MCP] Failed to restart {server_name}")
+
     async def health_check_loop(self, interval: int = 60):
         """
         Background task that monitors server health.
@@ -526,17 +711,15 @@ class MCPManager:
             try:
                 await asyncio.sleep(interval)
 
-                # Check all connected servers
-                for server_name in list(self.sessions.keys()):
-                    is_healthy = await self.health_check(server_name)
-
-                    if not is_healthy:
-                        logger.warning(f"[MCP] Server {server_name} unhealthy, restarting...")
-                        success = await self.restart_server(server_name)
-                        if success:
-                            logger.info(f"[MCP] Server {server_name} restarted successfully")
-                        else:
-                            logger.error(f"[MCP] Failed to restart {server_name}")
+                # Check all connected servers concurrently (bounded); one slow or
+                # restarting server no longer delays the checks of the others
+                results = await asyncio.gather(
+                    *(self._check_and_restart(name) for name in list(self.sessions.keys())),
+                    return_exceptions=True,
+                )
+                for res in results:
+                    if isinstance(res, Exception):
+                        logger.error(f"[MCP] Health check error: {res}")
 
             except asyncio.CancelledError:
                 logger.info("[MCP] Health check loop cancelled")
@@ -562,9 +745,27 @@ class MCPManager:
         Generates a concise catalog of all configured MCP servers and their roles.
         Includes a list of available tool names for each server to assist Atlas in planning.
         """
+        # Reuse a recent catalog while the set of connected servers is unchanged
+        connected = frozenset(self.sessions)
+        cached = self._catalog_cache
+        if (
+            cached is not None
+            and cached[1] == connected
+            and time.monotonic() - cached[0] < CATALOG_CACHE_TTL_S
+        ):
+            return cached[2]
+
         catalog = "MCP SERVER CATALOG (Available Realms):\n"
         configured_servers = self.config.get("mcpServers", {})
 
+        async def tools_or_raise(server_name: str) -> List[Any]:
+            # list_tools() reports failures as []; tell them apart from a server that
+            # really has no tools (that one is still cached for the live session)
+            tools = await self.list_tools(server_name)
+            if not tools and self.cached_tools(server_name) is None:
+                raise LookupError(f"Could not list tools for {server_name}")
+            return tools
+
         # Prepare tasks for fetching tools in parallel
         tasks = []
         server_names = []
@@ -575,7 +776,7 @@ class MCPManager:
 
             # Only attempt to fetch tools if server is not disabled
             if not server_cfg.get("disabled", False):
-                tasks.append(self.list_tools(server_name))
+                tasks.append(tools_or_raise(server_name))
                 server_names.append(server_name)
 
         # Fetch all tools with a timeout to prevent hanging
@@ -586,6 +787,9 @@ class MCPManager:
             )
         except Exception:
             all_tools_results = [[] for _ in tasks]  # Fallback to empty lists on overall timeout
+            complete = False
+        else:
+            complete = all(isinstance(res, list) for res in all_tools_results)
 
         # Map results back to servers
         server_tools_map = {}
@@ -615,6 +819,9 @@ class MCPManager:
             catalog += f"[{status}] {server_name}: {description}{tool_str}\n"
 
         catalog += "\nTo see specific tool schemas, use 'inspect_mcp_server' (or it will be done automatically by Tetyana)."
+        # Partial catalogs (timeouts, errors) are not cached so the next call retries
+        if complete:
+            self._catalog_cache = (time.monotonic(), frozenset(self.sessions), catalog)
         return catalog
 
     async def get_tools_summary(self) -> str:
@@ -667,7 +874,7 @@ class MCPManager:
         logger.info(f"[MCP] Restarting server: {server_name}")
         
         # 1. Stop if running
-        async with self._lock:
+        async with self._lock, self._server_lock(server_name):
             if server_name in self._close_events:
                 self._close_events[server_name].set()
             
@@ -680,6 +887,7 @@ class MCPManager:
             
             # Clear internal state
             self.sessions.pop(server_name, None)
+            self._tools_cache.pop(server_name, None)
             self._connection_tasks.pop(server_name, None)
             self._close_events.pop(server_name, None)
             self._session_futures.pop(server_name, None)
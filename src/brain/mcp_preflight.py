@@ -1,8 +1,18 @@
+import asyncio
+import functools
 import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple
+from urllib.parse import quote
+
+
+# Shared by every scan and async check: worker threads survive across asyncio.run()
+# calls (unlike the per-loop default executor) and at most 8 lookups or `npm`/python
+# subprocesses run at once, which keeps a large config from causing a fork storm.
+_EXEC = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mcp-preflight")
 
 
 def _run_cmd(cmd: List[str], timeout: int = 10) -> Tuple[int, str, str]:
@@ -33,16 +43,53 @@ def _parse_package_arg(arg: str) -> Optional[Tuple[str, str]]:
 
 
 def npm_package_exists(pkg: str, ver: str) -> bool:
-    """Check if npm has pkg@ver available."""
+    """Check if npm has pkg@ver available.
+
+    Definitive answers are memoized per process; timeouts and npm or network
+    failures return False without being cached.
+    """
+    try:
+        return _npm_view_has_version(pkg, ver)
+    except RuntimeError:
+        return False
+
+
+@functools.lru_cache(maxsize=512)
+def _npm_view_has_version(pkg: str, ver: str) -> bool:
+    # Raises on transient errors so lru_cache only keeps definitive results
     npm = shutil.which("npm") or "npm"
     cmd = [npm, "view", f"{pkg}@{ver}", "version"]
     rc, out, err = _run_cmd(cmd)
-    return rc == 0 and bool(out.strip())
+    if rc == 0:
+        # An unknown version of a known package prints nothing
+        return bool(out.strip())
+    # Unknown packages are E404; anything else (timeout, no npm, offline) is inconclusive
+    if "E404" in err:
+        return False
+    raise RuntimeError(f"npm view {pkg}@{ver} failed (rc={rc}): {err.strip()[:200]}")
+
+
+import httpx  # noqa: E402
 
+try:
+    import h2  # noqa: F401, E402
 
-import urllib.error  # noqa: E402
-import urllib.parse  # noqa: E402
-import urllib.request  # noqa: E402
+    _HTTP2 = True
+except ImportError:  # pragma: no cover
+    _HTTP2 = False
+
+# Shared keep-alive pool for registry lookups: one TLS handshake to registry.npmjs.org
+# is reused across packages. httpx.Client is thread-safe, so the concurrent scan
+# (worker threads) and async callers (via to_thread) share it.
+_CLIENT = httpx.Client(
+    base_url="https://registry.npmjs.org",
+    http2=_HTTP2,
+    timeout=10.0,
+    follow_redirects=True,
+    limits=httpx.Limits(max_keepalive_connections=20),
+    # Abbreviated metadata: no READMEs or per-version manifests
+    headers={"Accept": "application/vnd.npm.install-v1+json"},
+)
 
 
 def npm_registry_has_version(pkg: str, ver: str) -> bool:
@@ -50,49 +97,43 @@ def npm_registry_has_version(pkg: str, ver: str) -> bool:
 
     Special handling for tags (eg. 'latest'): fetch package metadata and inspect
     `dist-tags` and `versions` to confirm availability.
+
+    Definitive answers are memoized per process (configs repeat packages across
+    servers); transient failures return False without being cached.
     """
     try:
-        encoded = urllib.parse.quote(pkg, safe="")
-        # If version is the literal 'latest' or looks like a non-version tag, query metadata
-        if ver == "latest" or not ver[0].isdigit():
-            url = f"https://registry.npmjs.org/{encoded}"
-            req = urllib.request.Request(
-                url, headers={"Accept": "application/vnd.npm.install-v1+json"}
-            )
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                data = resp.read()
-                import json  # noqa: E402
-
-                meta = json.loads(data.decode())
-                # Check dist-tags and versions
-                dist = meta.get("dist-tags", {}) or {}
-                versions = meta.get("versions", {}) or {}
-                if ver in dist:
-                    # ensure the referenced version exists in versions
-                    if dist[ver] in versions:
-                        return True
-                    # sometimes dist-tags may include a tag pointing to a non-published version, treat as False
-                    return False
-                # fallback: if 'latest' requested and versions has entries, accept
-                if ver == "latest" and "latest" in dist:
-                    return dist["latest"] in versions
-                return False
-        else:
-            # Direct version lookup is faster if we know the exact version string
-            url = f"https://registry.npmjs.org/{encoded}/{ver}"
-            req = urllib.request.Request(
-                url, headers={"Accept": "application/vnd.npm.install-v1+json"}
-            )
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                return getattr(resp, "status", 200) == 200
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return False
-        return False
+        return _registry_has_version(pkg, ver)
     except Exception:
         return False
 
 
+@functools.lru_cache(maxsize=512)
+def _registry_has_version(pkg: str, ver: str) -> bool:
+    # Raises on transient errors so lru_cache only keeps definitive results
+    encoded = quote(pkg, safe="")
+    # Tags (eg. 'latest') resolve through the dist-tags endpoint, a few hundred bytes
+    # instead of the package document whose `versions` map runs to MBs for popular
+    # packages. The resolved version is then confirmed like any explicit version.
+    if ver == "latest" or not ver[0].isdigit():
+        resp = _CLIENT.get(f"/-/package/{encoded}/dist-tags")
+        if resp.status_code == 404:
+            return False
+        resp.raise_for_status()
+        dist = resp.json() or {}
+        resolved = dist.get(ver)
+        # sometimes dist-tags may include a tag pointing to a non-published version, treat as False
+        if not resolved or not resolved[0].isdigit():
+            return False
+        return _registry_has_version(pkg, resolved)
+
+    # Direct version lookup is faster if we know the exact version string
+    resp = _CLIENT.get(f"/{encoded}/{ver}")
+    if resp.status_code == 404:
+        return False
+    resp.raise_for_status()
+    return resp.status_code == 200
+
+
 def bunx_package_exists(pkg: str, ver: str) -> bool:
     """Check bunx packages. Prefer bun registry query if possible, otherwise fall back to npm registry."""
     # If bun is installed we could attempt bun-specific calls in future, but
@@ -159,6 +200,12 @@ def check_package_arg_for_tool(arg: str, tool_cmd: str = "npx") -> bool:
     return True
 
 
+async def check_package_arg_for_tool_async(arg: str, tool_cmd: str = "npx") -> bool:
+    """check_package_arg_for_tool without blocking the event loop on registry I/O."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXEC, check_package_arg_for_tool, arg, tool_cmd)
+
+
 def check_system_limits() -> List[str]:
     """Check OS process limits and return list of human-readable issues found.
 
@@ -207,57 +254,92 @@ def check_system_limits() -> List[str]:
     return issues
 
 
+def _scan_server(name: str, s: dict) -> List[str]:
+    """Return issue strings for a single MCP server entry (blocking: registry/subprocess)."""
+    issues: List[str] = []
+    cmd = s.get("command")
+    args = s.get("args", [])
+    if not cmd or not args:
+        return issues
+    first = args[0]
+    # npm / bun checks (package@version syntax)
+    if cmd == "npx" or cmd == "bunx":
+        ok = check_package_arg_for_tool(first, tool_cmd=cmd)
+        if not ok:
+            issues.append(f"{name}: package {first} not found (command={cmd})")
+        return issues
+    # Python entrypoints: detect -m or -c usages and attempt to ensure modules are importable
+    # Accept commands like 'python', 'python3', or full path to a python binary
+    basename = Path(cmd).name if cmd else cmd
+    if basename and basename.startswith("python"):
+        # -m <module>
+        if "-m" in args:
+            try:
+                idx = args.index("-m")
+                module = args[idx + 1]
+                if not python_module_importable(module):
+                    issues.append(
+                        f"{name}: python module {module} not importable (command={cmd} -m)"
+                    )
+            except Exception:
+                issues.append(f"{name}: could not parse -m module (command={cmd})")
+        # -c '<code>'
+        if "-c" in args:
+            try:
+                idx = args.index("-c")
+                code = args[idx + 1]
+                mods = _extract_modules_from_python_code(code)
+                for m in mods:
+                    if not python_module_importable(m):
+                        issues.append(
+                            f"{name}: python module {m} not importable (command={cmd} -c)"
+                        )
+            except Exception:
+                issues.append(f"{name}: could not parse -c code (command={cmd})")
+    return issues
+
+
+def _load_enabled_servers(config_path: Path) -> List[Tuple[str, dict]]:
+    import json  # noqa: E402
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    servers = cfg.get("mcpServers", {})
+    return [
+        (name, s)
+        for name, s in servers.items()
+        if not name.startswith("_") and not s.get("disabled")
+    ]
+
+
+async def scan_mcp_config_for_package_issues_async(config_path: Path) -> List[str]:
+    """Async variant of scan_mcp_config_for_package_issues.
+
+    Each server is checked on the shared worker pool and all checks run concurrently,
+    so total time is the slowest registry/subprocess lookup instead of their sum.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        servers = _load_enabled_servers(config_path)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(_EXEC, _scan_server, name, s) for name, s in servers)
+        )
+    except Exception as e:
+        return [f"Could not read/scan MCP config: {e}"]
+    return [issue for server_issues in results for issue in server_issues]
+
+
 def scan_mcp_config_for_package_issues(config_path: Path) -> List[str]:
     """Given a path to MCP config JSON, return list of issue strings found."""
-    import json  # noqa: E402
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(scan_mcp_config_for_package_issues_async(config_path))
 
-    issues: List[str] = []
+    # Called from inside a running event loop: block on the pool directly (still concurrent)
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
-        servers = cfg.get("mcpServers", {})
-        for name, s in servers.items():
-            if name.startswith("_") or s.get("disabled"):
-                continue
-            cmd = s.get("command")
-            args = s.get("args", [])
-            if not cmd or not args:
-                continue
-            first = args[0]
-            # npm / bun checks (package@version syntax)
-            if cmd == "npx" or cmd == "bunx":
-                ok = check_package_arg_for_tool(first, tool_cmd=cmd)
-                if not ok:
-                    issues.append(f"{name}: package {first} not found (command={cmd})")
-                continue
-            # Python entrypoints: detect -m or -c usages and attempt to ensure modules are importable
-            # Accept commands like 'python', 'python3', or full path to a python binary
-            basename = Path(cmd).name if cmd else cmd
-            if basename and basename.startswith("python"):
-                # -m <module>
-                if "-m" in args:
-                    try:
-                        idx = args.index("-m")
-                        module = args[idx + 1]
-                        if not python_module_importable(module):
-                            issues.append(
-                                f"{name}: python module {module} not importable (command={cmd} -m)"
-                            )
-                    except Exception:
-                        issues.append(f"{name}: could not parse -m module (command={cmd})")
-                # -c '<code>'
-                if "-c" in args:
-                    try:
-                        idx = args.index("-c")
-                        code = args[idx + 1]
-                        mods = _extract_modules_from_python_code(code)
-                        for m in mods:
-                            if not python_module_importable(m):
-                                issues.append(
-                                    f"{name}: python module {m} not importable (command={cmd} -c)"
-                                )
-                    except Exception:
-                        issues.append(f"{name}: could not parse -c code (command={cmd})")
+        servers = _load_enabled_servers(config_path)
+        results = list(_EXEC.map(lambda entry: _scan_server(*entry), servers))
     except Exception as e:
-        issues.append(f"Could not read/scan MCP config: {e}")
-    return issues
+        return [f"Could not read/scan MCP config: {e}"]
+    return [issue for server_issues in results for issue in server_issues]
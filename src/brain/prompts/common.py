@@ -106,6 +106,14 @@ AVAILABLE VIBE TOOLS:
    Purpose: Check Vibe CLI installation path and version
    Example: vibe_which()
 
+8. **vibe_rehash**
+   Purpose: Re-resolve the Vibe CLI binary path (after installing or moving Vibe)
+   Example: vibe_rehash()
+
+9. **vibe_refresh_env**
+   Purpose: Re-snapshot environment variables passed to Vibe (after changing API keys etc.)
+   Example: vibe_refresh_env()
+
 TRINITY NATIVE SYSTEM TOOLS (Any Agent):
 - `restart_mcp_server(server_name)`: Force restart an MCP server.
 - `query_db(query, params)`: Query the internal system database.
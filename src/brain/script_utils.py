@@ -0,0 +1,32 @@
+"""
+Shared helpers for the MCP diagnostic scripts under scripts/ and the MCP tests.
+"""
+
+import asyncio
+from typing import Any, Coroutine, Tuple
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+
+def configured_servers(mcp_manager, skip_disabled: bool = False) -> Tuple[str, ...]:
+    """Sorted MCP server names from mcp_manager's current config, without `_comment`-style keys.
+
+    Not cached: reload_config_if_changed() can replace the config at any time.
+    """
+    servers = mcp_manager.config.get("mcpServers", {}) or {}
+    return tuple(
+        sorted(
+            name
+            for name, cfg in servers.items()
+            if not name.startswith("_") and not (skip_disabled and cfg.get("disabled"))
+        )
+    )
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """asyncio.run() for script entry points, on uvloop when it is installed."""
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        return runner.run(main)
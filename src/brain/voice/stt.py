@@ -6,8 +6,7 @@ Fallback: Browser Web Speech API (handled in frontend)
 """
 
 import asyncio
-import os
-import tempfile
+import threading
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -28,12 +27,11 @@ except ImportError:
 # Try to import audio recording
 try:
     import sounddevice as sd
-    import soundfile as sf
 
     AUDIO_AVAILABLE = True
 except ImportError:
     AUDIO_AVAILABLE = False
-    print("[STT] Warning: sounddevice/soundfile not installed. Audio recording disabled.")
+    print("[STT] Warning: sounddevice not installed. Audio recording disabled.")
 
 
 class SpeechType(str, Enum):
@@ -77,6 +75,11 @@ class WhisperSTT:
     Speech-to-Text using Faster Whisper (CTranslate2)
     """
 
+    # Loaded models shared by every instance in the process, keyed by
+    # (model_name, device, compute_type); the lock makes concurrent first loads build one
+    _MODEL_CACHE: Dict[tuple, Any] = {}
+    _MODEL_CACHE_LOCK = threading.Lock()
+
     def __init__(self, model_name: str = None, device: str = None):
         # Get STT config from config.yaml
         stt_config = config.get("voice.stt", {})
@@ -112,8 +115,14 @@ class WhisperSTT:
         self._model = None
         self.download_root = CONFIG_ROOT / "models" / "faster-whisper"
 
-        # Compute type selection based on device
-        if self.device == "cuda":
+        # Compute type selection based on device (voice.stt.compute_type overrides,
+        # eg. "int8_float16" to opt into int8 weights with fp16 activations on CUDA).
+        # CTranslate2 quantizes the weights to int8 at load time, so no separate
+        # int8 checkpoint is needed; int8 matmuls roughly double CPU throughput.
+        configured_compute = stt_config.get("compute_type", "auto")
+        if configured_compute != "auto":
+            self.compute_type = configured_compute
+        elif self.device == "cuda":
             self.compute_type = "float16"
         else:
             self.compute_type = "int8"  # Best for CPU/MPS stability and speed
@@ -131,22 +140,41 @@ class WhisperSTT:
                 logger.error("[STT] faster-whisper is not installed. Cannot load WhisperModel.")
                 return None
 
+            key = (self.model_name, self.device, self.compute_type)
+            self._model = WhisperSTT._MODEL_CACHE.get(key)
+            if self._model is not None:
+                return self._model
+
             print(f"[STT] Loading Faster-Whisper model: {self.model_name} on {self.device}...")
             self.download_root.mkdir(parents=True, exist_ok=True)
 
-            def load():
+            def build(local_files_only: bool):
                 return WhisperModel(
                     self.model_name,
                     device=self.device,
                     compute_type=self.compute_type,
                     download_root=str(self.download_root),
+                    local_files_only=local_files_only,
                 )
 
+            def load():
+                with WhisperSTT._MODEL_CACHE_LOCK:
+                    model = WhisperSTT._MODEL_CACHE.get(key)
+                    if model is None:
+                        try:
+                            # Already downloaded: load from disk without a Hugging Face Hub lookup
+                            model = build(local_files_only=True)
+                        except Exception:
+                            model = build(local_files_only=False)
+                        WhisperSTT._MODEL_CACHE[key] = model
+                    return model
+
             self._model = await asyncio.to_thread(load)
             print(f"[STT] Model loaded successfully from {self.download_root}")
         return self._model
 
-    async def transcribe_file(self, audio_path: str, language: str = None) -> TranscriptionResult:
+    async def transcribe_file(self, audio_path: Any, language: str = None) -> TranscriptionResult:
+        """Transcribe an audio file path, or 16 kHz mono float32 samples (numpy array)."""
         language = language or self.language
 
         if not WHISPER_AVAILABLE:
@@ -393,19 +421,14 @@ class WhisperSTT:
 
         fs = 16000
         print(f"[STT] Recording for {duration} seconds...")
-        recording = await asyncio.to_thread(sd.rec, int(duration * fs), samplerate=fs, channels=1)
+        recording = await asyncio.to_thread(
+            sd.rec, int(duration * fs), samplerate=fs, channels=1, dtype="float32"
+        )
         await asyncio.to_thread(sd.wait)
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tf:
-            wav_path = tf.name
-            await asyncio.to_thread(sf.write, wav_path, recording, fs)
-
-        try:
-            result = await self.transcribe_file(wav_path, language)
-            return result
-        finally:
-            if os.path.exists(wav_path):
-                os.remove(wav_path)
+        # Already 16 kHz mono float32 - what Whisper's feature extractor consumes - so hand
+        # the samples over directly instead of a WAV round-trip (encode, write, decode, resample)
+        return await self.transcribe_file(recording.reshape(-1), language)
 
 
 # MCP Wrapper
@@ -3,14 +3,16 @@ MCP Config Loader
 Loads MCP server configurations from config.yaml
 """
 
+import functools
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import yaml
 
 
+@functools.lru_cache(maxsize=1)
 def load_mcp_config() -> Dict[str, Any]:
-    """Load MCP configuration from config.yaml"""
+    """Load MCP configuration from config.yaml (parsed once per process)"""
     config_path = Path.home() / ".config" / "atlastrinity" / "config.yaml"
 
     if config_path.exists():
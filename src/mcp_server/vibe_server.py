@@ -17,27 +17,42 @@ Updated: 2026-01-14
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import os
 import shutil
+import string
 import subprocess
-from typing import Any, Dict, List, Optional
+from textwrap import dedent
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 
 from mcp.server import FastMCP
 
+# orjson is considerably faster on large Vibe JSON payloads; stdlib json is the fallback.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+# Tool results stay plain dicts: FastMCP serializes return values through pydantic,
+# which does not understand msgspec/attrs structs.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
 # Setup logging for visibility in Electron app
 logger = logging.getLogger("vibe_mcp")
 logger.setLevel(logging.INFO)
 
 try:
-    from .config_loader import get_config_value
+    from .config_loader import get_server_config
 
-    VIBE_BINARY = get_config_value("vibe", "binary", "vibe")
-    DEFAULT_TIMEOUT_S = float(get_config_value("vibe", "timeout_s", 300))
+    _vibe_config = get_server_config("vibe")
+    VIBE_BINARY = _vibe_config.get("binary", "vibe")
+    DEFAULT_TIMEOUT_S = float(_vibe_config.get("timeout_s", 300))
     # Increased for large log analysis
-    MAX_OUTPUT_CHARS = int(get_config_value("vibe", "max_output_chars", 500000))
-    DISALLOW_INTERACTIVE = bool(get_config_value("vibe", "disallow_interactive", True))
+    MAX_OUTPUT_CHARS = int(_vibe_config.get("max_output_chars", 500000))
+    DISALLOW_INTERACTIVE = bool(_vibe_config.get("disallow_interactive", True))
 except Exception:
     VIBE_BINARY = "vibe"
     DEFAULT_TIMEOUT_S = 300.0
@@ -48,68 +63,282 @@ from pathlib import Path
 PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
 LOG_DIR = str(Path.home() / ".config" / "atlastrinity" / "logs")
 
+# Chunk size for incremental reads of Vibe stdout/stderr
+READ_CHUNK_SIZE = 65536
+TRUNCATION_MARKER = b"\n... [TRUNCATED - Output exceeded 500KB] ..."
+
 
 # CLI-only subcommands (no TUI)
-ALLOWED_SUBCOMMANDS = {
-    "list-editors",
-    "list-modules",
-    "run",
-    "enable",
-    "disable",
-    "install",
-    "smart-plan",
-    "ask",
-    "agent-reset",
-    "agent-on",
-    "agent-off",
-    "vibe-status",
-    "vibe-continue",
-    "vibe-cancel",
-    "vibe-help",
-    "eternal-engine",
-    "screenshots",
-}
+ALLOWED_SUBCOMMANDS: frozenset[str] = frozenset(
+    {
+        "list-editors",
+        "list-modules",
+        "run",
+        "enable",
+        "disable",
+        "install",
+        "smart-plan",
+        "ask",
+        "agent-reset",
+        "agent-on",
+        "agent-off",
+        "vibe-status",
+        "vibe-continue",
+        "vibe-cancel",
+        "vibe-help",
+        "eternal-engine",
+        "screenshots",
+    }
+)
 
 # Subcommands that are BLOCKED (interactive TUI)
-BLOCKED_SUBCOMMANDS = {
-    "tui",
-    "agent-chat",  # Use vibe_prompt instead for programmatic mode
-    "self-healing-status",  # TUI mode, use vibe_prompt for queries
-    "self-healing-scan",  # TUI mode, use vibe_prompt for queries
-}
+BLOCKED_SUBCOMMANDS: frozenset[str] = frozenset(
+    {
+        "tui",
+        "agent-chat",  # Use vibe_prompt instead for programmatic mode
+        "self-healing-status",  # TUI mode, use vibe_prompt for queries
+        "self-healing-scan",  # TUI mode, use vibe_prompt for queries
+    }
+)
+
+# Sorted once for error responses
+_ALLOWED_SORTED = tuple(sorted(ALLOWED_SUBCOMMANDS))
+
+
+# Prompt templates for the structured Vibe tools (built once at import)
+_ANALYZE_ERROR_TEMPLATE = string.Template(
+    dedent(
+        """\
+        AUTONOMOUS ERROR ANALYSIS AND REPAIR
+
+        CONTEXT:
+        - Project Root: $project_root
+        - Logs Directory: $log_dir
+        - OS: macOS
+
+        ERROR MESSAGE:
+        $error_message$log_section$file_section
+
+        INSTRUCTIONS:
+        $instructions"""
+    )
+)
+
+_ANALYZE_ERROR_FIX_INSTRUCTIONS = dedent(
+    """\
+    1. Analyze the error thoroughly using logs and source code.
+    2. Identify the root cause.
+    3. ACTIVELY FIX the issue (edit code, run commands).
+    4. If you modify Swift code in 'vendor/mcp-server-macos-use', you MUST recompile it by running 'swift build -c release' in that directory.
+    5. After any fix to an MCP server, use 'vibe_restart_mcp_server(server_name)' to apply changes.
+    6. Verify the fix works.
+    7. Provide a detailed summary."""
+)
+
+_ANALYZE_ERROR_SUGGEST_INSTRUCTIONS = dedent(
+    """\
+    1. Analyze the error thoroughly
+    2. Identify the root cause
+    3. Suggest specific fixes (without applying them)
+    4. Explain why each fix would work"""
+)
+
+_CODE_REVIEW_TEMPLATE = string.Template(
+    dedent(
+        """\
+        CODE REVIEW REQUEST: $file_path
+
+        Please review this code and provide:
+        1. Overall code quality assessment
+        2. Potential bugs or issues
+        3. Security concerns (if any)
+        4. Performance improvements
+        5. Code style and best practices$focus_section"""
+    )
+)
+
+_SMART_PLAN_TEMPLATE = string.Template(
+    dedent(
+        """\
+        SMART PLANNING REQUEST
+
+        OBJECTIVE: $objective$context_section
+
+        Create a detailed, step-by-step execution plan.
+        For each step, specify:
+        - Action to perform
+        - Required tools/commands
+        - Expected outcome
+        - Verification criteria"""
+    )
+)
 
 
 server = FastMCP("vibe")
 
+# Environment snapshot passed to every Vibe subprocess; rebuilt via vibe_refresh_env
+_BASE_ENV: Dict[str, str] = dict(os.environ)
+
+# `vibe --version` output per resolved binary path; cleared by vibe_rehash
+_version_cache: Dict[str, str] = {}
+
+# In-flight Vibe runs keyed by their effective command, so identical concurrent
+# requests share a single subprocess instead of each spawning their own.
+_inflight: Dict[Hashable, "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+def _truncate(data: bytearray, truncated: bool) -> str:
+    """Decode captured output, appending an indicator if it was cut at max output chars."""
+    # Append in place and decode once, so the capped buffer is never copied
+    if truncated:
+        data += TRUNCATION_MARKER
+    return data.decode(errors="replace")
+
+
+async def _read_stream(
+    stream: asyncio.StreamReader,
+    prefix: str,
+    on_line: Optional[Callable[[bytes], None]] = None,
+) -> Tuple[bytearray, bool]:
+    """
+    Read a child process stream incrementally, logging each line as it arrives.
+
+    At most MAX_OUTPUT_CHARS bytes are kept; anything beyond that is logged
+    and then discarded, so memory stays bounded regardless of output size.
+    If `on_line` is given, it is called with every complete line as it is read;
+    a line longer than MAX_OUTPUT_CHARS is passed on cut at that length.
+
+    Returns:
+        Tuple of (captured bytes, whether output was truncated).
+    """
+    buf = bytearray()
+    truncated = False
+    pending = b""
+    # Already-logged head of an over-long line, kept (up to MAX_OUTPUT_CHARS) for on_line
+    line_head = bytearray()
+
+    # Resolve the level once per stream; skip decoding lines nobody will see
+    if "error" in prefix.lower() or "stderr" in prefix.lower():
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    log_enabled = logger.isEnabledFor(level)
+
+    def log_line(raw: bytes) -> None:
+        # Log in real-time for UI visibility
+        if log_enabled:
+            logger.log(level, "[%s] %s", prefix, raw.decode(errors="replace").rstrip())
+
+    def end_line(line: bytes) -> None:
+        log_line(line)
+        if on_line:
+            if line_head:
+                line_head.extend(line[: MAX_OUTPUT_CHARS - len(line_head)])
+                line = bytes(line_head)
+                line_head.clear()
+            on_line(line)
+
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        remaining = MAX_OUTPUT_CHARS - len(buf)
+        buf.extend(chunk[:remaining])
+        if len(chunk) > remaining:
+            truncated = True
+
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            end_line(line)
+        # Don't let a single unterminated line grow without bound
+        if len(pending) >= READ_CHUNK_SIZE:
+            log_line(pending)
+            if on_line:
+                line_head.extend(pending[: MAX_OUTPUT_CHARS - len(line_head)])
+            pending = b""
+
+    if pending or line_head:
+        end_line(pending)
+
+    return buf, truncated
+
+
+async def _coalesce(
+    key: Hashable, run: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Run `run()` once per key among concurrent callers (single-flight).
+
+    Callers arriving while an identical request is in flight await the same
+    task. Each caller gets its own shallow copy of the result dict.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(run())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.info("[VIBE] Identical request already in flight, awaiting its result")
 
-def _truncate(text: str) -> str:
-    """Truncate text to max output chars with indicator."""
-    if not isinstance(text, str):
-        text = str(text)
-    if len(text) <= MAX_OUTPUT_CHARS:
-        return text
-    return text[:MAX_OUTPUT_CHARS] + "\n... [TRUNCATED - Output exceeded 500KB] ..."
+    # Shield so one cancelled caller doesn't cancel the run for everyone else
+    result = await asyncio.shield(task)
+    return dict(result)
 
 
+@functools.lru_cache(maxsize=1)
 def _resolve_vibe_binary() -> Optional[str]:
-    """Resolve the path to the Vibe CLI binary."""
-    if os.path.isabs(VIBE_BINARY) and os.path.exists(VIBE_BINARY):
-        return VIBE_BINARY
+    """
+    Resolve the path to the Vibe CLI binary.
+
+    The result is cached for the lifetime of the server to avoid a PATH walk
+    on every tool call. Use the `vibe_rehash` tool to re-resolve it.
+    """
+    if os.path.isabs(VIBE_BINARY):
+        # A single access() check; no need for a PATH search
+        return VIBE_BINARY if os.access(VIBE_BINARY, os.X_OK) else None
     return shutil.which(VIBE_BINARY)
 
 
+async def _vibe_version(vibe_path: str) -> str:
+    """Return `vibe --version` for the given binary, cached per path after the first success."""
+    version = _version_cache.get(vibe_path)
+    if version is not None:
+        return version
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            vibe_path,
+            "--version",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await process.communicate()
+    except Exception:
+        return "unknown"
+
+    if process.returncode != 0:
+        return "unknown"
+
+    version = stdout.decode().strip() or "unknown"
+    _version_cache[vibe_path] = version
+    return version
+
+
 async def _run_vibe(
     argv: List[str],
     cwd: Optional[str],
     timeout_s: float,
     extra_env: Optional[Dict[str, str]],
+    on_stdout_line: Optional[Callable[[bytes], None]] = None,
 ) -> Dict[str, Any]:
     """Execute Vibe CLI command and return structured result with real-time logging."""
-    env = os.environ.copy()
+    env = _BASE_ENV
     if extra_env:
-        env.update({k: str(v) for k, v in extra_env.items()})
+        env = {**_BASE_ENV, **{k: str(v) for k, v in extra_env.items()}}
 
-    logger.info(f"[VIBE] Executing: {' '.join(argv)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[VIBE] Executing: %s", " ".join(argv))
 
     try:
         process = await asyncio.create_subprocess_exec(
@@ -120,32 +349,17 @@ async def _run_vibe(
             stderr=asyncio.subprocess.PIPE
         )
 
-        stdout_chunks = []
-        stderr_chunks = []
-
-        async def read_stream(stream, chunks, prefix):
-            while True:
-                line = await stream.readline()
-                if not line:
-                    break
-                text = line.decode().rstrip()
-                chunks.append(text + "\n")
-                # Log in real-time for UI visibility
-                if "error" in prefix.lower() or "stderr" in prefix.lower():
-                    logger.warning(f"[{prefix}] {text}")
-                else:
-                    # Filter out some common vibe noise if needed, or just show all
-                    logger.info(f"[{prefix}] {text}")
-
         # Run reading tasks concurrently with a timeout
         try:
-            await asyncio.wait_for(
-                asyncio.gather(
-                    read_stream(process.stdout, stdout_chunks, "VIBE-OUT"),
-                    read_stream(process.stderr, stderr_chunks, "VIBE-ERR"),
-                    process.wait()
-                ),
-                timeout=float(timeout_s)
+            (stdout_bytes, stdout_truncated), (stderr_bytes, stderr_truncated), _ = (
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        _read_stream(process.stdout, "VIBE-OUT", on_stdout_line),
+                        _read_stream(process.stderr, "VIBE-ERR"),
+                        process.wait(),
+                    ),
+                    timeout=float(timeout_s),
+                )
             )
         except asyncio.TimeoutError:
             try:
@@ -157,10 +371,10 @@ async def _run_vibe(
             logger.error(f"[VIBE] {error_msg}")
             return {"error": error_msg, "command": argv}
 
-        stdout = "".join(stdout_chunks)
-        stderr = "".join(stderr_chunks)
+        stdout = _truncate(stdout_bytes, stdout_truncated)
+        stderr = _truncate(stderr_bytes, stderr_truncated)
 
-        logger.info(f"[VIBE] Exit code: {process.returncode}")
+        logger.info("[VIBE] Exit code: %s", process.returncode)
         
         if process.returncode != 0 and not stdout:
             return {
@@ -237,25 +451,58 @@ async def _run_vibe_programmatic(
 
     logger.info(f"[VIBE PROGRAMMATIC] Prompt: {prompt[:100]}...")
 
-    result = await _run_vibe(
-        argv=argv,
-        cwd=cwd,
-        timeout_s=timeout_s,
-        extra_env=None,
-    )
+    async def execute() -> Dict[str, Any]:
+        # Streaming output is newline-delimited JSON: parse each event as it arrives
+        # instead of re-scanning the whole buffered stdout afterwards.
+        # Like captured stdout, at most MAX_OUTPUT_CHARS bytes of events are kept.
+        events: List[Any] = []
+        events_bytes = 0
+        dropped = {"unparsable": 0, "over_limit": 0}
+
+        def collect_event(line: bytes) -> None:
+            nonlocal events_bytes
+            if not line.strip():
+                return
+            if events_bytes + len(line) > MAX_OUTPUT_CHARS:
+                dropped["over_limit"] += 1
+                return
+            try:
+                events.append(_json_loads(line))
+            except json.JSONDecodeError:
+                # Typically an event cut at MAX_OUTPUT_CHARS by _read_stream
+                dropped["unparsable"] += 1
+                logger.warning(f"[VIBE] Skipping unparsable streaming event ({len(line)} bytes)")
+                return
+            events_bytes += len(line)
+
+        result = await _run_vibe(
+            argv=argv,
+            cwd=cwd,
+            timeout_s=timeout_s,
+            extra_env=None,
+            on_stdout_line=collect_event if output_format == "streaming" else None,
+        )
 
-    # Parse JSON output if requested
-    if output_format == "json" and result.get("success") and result.get("stdout"):
-        try:
-            parsed = json.loads(result["stdout"])
-            result["parsed_response"] = parsed
-            logger.info("[VIBE] Parsed JSON response successfully")
-        except json.JSONDecodeError:
-            # If not valid JSON, keep raw stdout
-            logger.warning("[VIBE] Output was not valid JSON, keeping raw text")
-            result["parsed_response"] = None
+        # Parse JSON output if requested
+        if output_format == "json" and result.get("success") and result.get("stdout"):
+            try:
+                parsed = _json_loads(result["stdout"])
+                result["parsed_response"] = parsed
+                logger.info("[VIBE] Parsed JSON response successfully")
+            except json.JSONDecodeError:
+                # If not valid JSON, keep raw stdout
+                logger.warning("[VIBE] Output was not valid JSON, keeping raw text")
+                result["parsed_response"] = None
+        elif output_format == "streaming" and result.get("success"):
+            result["parsed_response"] = events
+            logger.info(f"[VIBE] Parsed {len(events)} streaming events")
+            if any(dropped.values()):
+                result["dropped_events"] = dropped
+                logger.warning(f"[VIBE] Streaming events not in parsed_response: {dropped}")
 
-    return result
+        return result
+
+    return await _coalesce((tuple(argv), cwd), execute)
 
 
 @server.tool()
@@ -270,19 +517,39 @@ async def vibe_which() -> Dict[str, Any]:
     if not vibe_path:
         return {"error": f"Vibe CLI not found on PATH (binary='{VIBE_BINARY}')"}
 
-    # Get version
-    try:
-        process = await asyncio.create_subprocess_exec(
-            vibe_path, "--version",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await process.communicate()
-        version = stdout.decode().strip() if process.returncode == 0 else "unknown"
-    except Exception:
-        version = "unknown"
+    return {"success": True, "binary": vibe_path, "version": await _vibe_version(vibe_path)}
+
+
+@server.tool()
+async def vibe_rehash() -> Dict[str, Any]:
+    """
+    Re-resolve the Vibe CLI binary path (e.g. after installing or moving Vibe).
+
+    Returns:
+        Dict with the newly resolved 'binary' path.
+    """
+    _resolve_vibe_binary.cache_clear()
+    _version_cache.clear()
+    vibe_path = _resolve_vibe_binary()
+    if not vibe_path:
+        return {"error": f"Vibe CLI not found on PATH (binary='{VIBE_BINARY}')"}
+    return {"success": True, "binary": vibe_path}
+
+
+@server.tool()
+async def vibe_refresh_env() -> Dict[str, Any]:
+    """
+    Re-snapshot the server environment used for Vibe subprocesses.
+
+    Call this after changing environment variables of the running server
+    (e.g. API keys) so subsequent Vibe runs pick them up.
 
-    return {"success": True, "binary": vibe_path, "version": version}
+    Returns:
+        Dict with the number of environment variables now in use.
+    """
+    global _BASE_ENV
+    _BASE_ENV = dict(os.environ)
+    return {"success": True, "env_vars": len(_BASE_ENV)}
 
 
 @server.tool()
@@ -309,7 +576,9 @@ async def vibe_prompt(
         max_turns: Maximum conversation turns (default 10)
 
     Returns:
-        Dict with 'success', 'stdout', 'parsed_response' (if JSON), 'stderr'
+        Dict with 'success', 'stdout', 'parsed_response' (if JSON; list of events if
+        streaming), 'stderr'; 'dropped_events' counts streaming events missing from
+        'parsed_response' (unparsable or over the output limit), when there are any
 
     Example:
         vibe_prompt(
@@ -359,50 +628,16 @@ async def vibe_analyze_error(
         Analysis results with suggested or applied fixes
     """
     # Construct a detailed prompt for error analysis
-    prompt_parts = [
-        "AUTONOMOUS ERROR ANALYSIS AND REPAIR",
-        "",
-        f"CONTEXT:",
-        f"- Project Root: {PROJECT_ROOT}",
-        f"- Logs Directory: {LOG_DIR}",
-        f"- OS: macOS",
-        "",
-        f"ERROR MESSAGE:\n{error_message}",
-    ]
-
-    if log_context:
-        prompt_parts.append(f"\nRECENT LOGS:\n{log_context}")
-
-    if file_path:
-        prompt_parts.append(f"\nFILE PATH: {file_path}")
-
-    if auto_fix:
-        prompt_parts.extend(
-            [
-                "",
-                "INSTRUCTIONS:",
-                "1. Analyze the error thoroughly using logs and source code.",
-                "2. Identify the root cause.",
-                "3. ACTIVELY FIX the issue (edit code, run commands).",
-                "4. If you modify Swift code in 'vendor/mcp-server-macos-use', you MUST recompile it by running 'swift build -c release' in that directory.",
-                "5. After any fix to an MCP server, use 'vibe_restart_mcp_server(server_name)' to apply changes.",
-                "6. Verify the fix works.",
-                "7. Provide a detailed summary.",
-            ]
-        )
-    else:
-        prompt_parts.extend(
-            [
-                "",
-                "INSTRUCTIONS:",
-                "1. Analyze the error thoroughly",
-                "2. Identify the root cause",
-                "3. Suggest specific fixes (without applying them)",
-                "4. Explain why each fix would work",
-            ]
-        )
-
-    prompt = "\n".join(prompt_parts)
+    prompt = _ANALYZE_ERROR_TEMPLATE.substitute(
+        project_root=PROJECT_ROOT,
+        log_dir=LOG_DIR,
+        error_message=error_message,
+        log_section=f"\n\nRECENT LOGS:\n{log_context}" if log_context else "",
+        file_section=f"\n\nFILE PATH: {file_path}" if file_path else "",
+        instructions=(
+            _ANALYZE_ERROR_FIX_INSTRUCTIONS if auto_fix else _ANALYZE_ERROR_SUGGEST_INSTRUCTIONS
+        ),
+    )
     eff_timeout = timeout_s if timeout_s is not None else 300.0
 
     logger.info(f"[VIBE] Starting error analysis (auto_fix={auto_fix})")
@@ -436,21 +671,10 @@ async def vibe_code_review(
     Returns:
         Code review analysis with suggestions
     """
-    prompt_parts = [
-        f"CODE REVIEW REQUEST: {file_path}",
-        "",
-        "Please review this code and provide:",
-        "1. Overall code quality assessment",
-        "2. Potential bugs or issues",
-        "3. Security concerns (if any)",
-        "4. Performance improvements",
-        "5. Code style and best practices",
-    ]
-
-    if focus_areas:
-        prompt_parts.append(f"\nFOCUS AREAS: {focus_areas}")
-
-    prompt = "\n".join(prompt_parts)
+    prompt = _CODE_REVIEW_TEMPLATE.substitute(
+        file_path=file_path,
+        focus_section=f"\n\nFOCUS AREAS: {focus_areas}" if focus_areas else "",
+    )
     eff_timeout = timeout_s if timeout_s is not None else 120.0
 
     logger.info(f"[VIBE] Starting code review for: {file_path}")
@@ -486,28 +710,10 @@ async def vibe_smart_plan(
     Returns:
         Structured plan with steps
     """
-    prompt_parts = [
-        "SMART PLANNING REQUEST",
-        "",
-        f"OBJECTIVE: {objective}",
-    ]
-
-    if context:
-        prompt_parts.append(f"\nCONTEXT:\n{context}")
-
-    prompt_parts.extend(
-        [
-            "",
-            "Create a detailed, step-by-step execution plan.",
-            "For each step, specify:",
-            "- Action to perform",
-            "- Required tools/commands",
-            "- Expected outcome",
-            "- Verification criteria",
-        ]
+    prompt = _SMART_PLAN_TEMPLATE.substitute(
+        objective=objective,
+        context_section=f"\n\nCONTEXT:\n{context}" if context else "",
     )
-
-    prompt = "\n".join(prompt_parts)
     eff_timeout = timeout_s if timeout_s is not None else DEFAULT_TIMEOUT_S
 
     logger.info(f"[VIBE] Generating smart plan for: {objective[:50]}...")
@@ -551,10 +757,6 @@ async def vibe_execute_subcommand(
     Blocked (use vibe_prompt instead):
         tui, agent-chat, self-healing-status, self-healing-scan
     """
-    vibe_path = _resolve_vibe_binary()
-    if not vibe_path:
-        return {"error": f"Vibe CLI not found on PATH (binary='{VIBE_BINARY}')"}
-
     sub = (subcommand or "").strip()
     if not sub:
         return {"error": "Missing subcommand"}
@@ -568,9 +770,13 @@ async def vibe_execute_subcommand(
     if sub not in ALLOWED_SUBCOMMANDS:
         return {
             "error": f"Subcommand not recognized: '{sub}'.",
-            "allowed": sorted(ALLOWED_SUBCOMMANDS),
+            "allowed": _ALLOWED_SORTED,
         }
 
+    vibe_path = _resolve_vibe_binary()
+    if not vibe_path:
+        return {"error": f"Vibe CLI not found on PATH (binary='{VIBE_BINARY}')"}
+
     argv: List[str] = [vibe_path, sub]
     if args:
         argv.extend([str(a) for a in args])
@@ -609,16 +815,19 @@ async def vibe_ask(
 
     logger.info(f"[VIBE] Asking question: {question[:50]}...")
 
-    result = await _run_vibe(argv=argv, cwd=cwd, timeout_s=eff_timeout, extra_env=None)
+    async def execute() -> Dict[str, Any]:
+        result = await _run_vibe(argv=argv, cwd=cwd, timeout_s=eff_timeout, extra_env=None)
 
-    # Parse JSON if possible
-    if result.get("success") and result.get("stdout"):
-        try:
-            result["parsed_response"] = json.loads(result["stdout"])
-        except json.JSONDecodeError:
-            result["parsed_response"] = None
+        # Parse JSON if possible
+        if result.get("success") and result.get("stdout"):
+            try:
+                result["parsed_response"] = _json_loads(result["stdout"])
+            except json.JSONDecodeError:
+                result["parsed_response"] = None
+
+        return result
 
-    return result
+    return await _coalesce((tuple(argv), cwd), execute)
 
 
 if __name__ == "__main__":
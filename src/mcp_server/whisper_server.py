@@ -1,4 +1,8 @@
+import asyncio
+import hashlib
 import os
+import time
+from collections import OrderedDict
 
 import httpx
 from mcp.server import FastMCP
@@ -8,10 +12,11 @@ from src.brain.voice.stt import WhisperSTT
 
 # Load config from YAML
 try:
-    from .config_loader import get_config_value
+    from .config_loader import get_server_config
 
-    STT_MODEL = get_config_value("whisper", "model", "large-v3-turbo")
-    STT_LANGUAGE = get_config_value("whisper", "language", "uk")
+    _whisper_config = get_server_config("whisper")
+    STT_MODEL = _whisper_config.get("model", "large-v3-turbo")
+    STT_LANGUAGE = _whisper_config.get("language", "uk")
 except Exception:
     STT_MODEL = config.get("voice.stt.model", "large-v3-turbo")
     STT_LANGUAGE = config.get("voice.stt.language", "uk")
@@ -19,48 +24,106 @@ except Exception:
 # Initialize FastMCP server
 server = FastMCP("whisper-stt")
 
+BRAIN_URL = "http://127.0.0.1:8000"
+
+# Shared keep-alive client for Brain API calls (avoids a new connection per request)
+_http_client = httpx.AsyncClient(
+    base_url=BRAIN_URL,
+    timeout=60.0,
+    limits=httpx.Limits(max_keepalive_connections=8),
+)
+
+# Brain liveness is cached for this long after a successful health check or STT call
+HEALTH_TTL_S = 5.0
+_last_brain_ok_at = 0.0
+
+# Recent transcripts keyed by (audio content digest, language), oldest first
+TRANSCRIPT_CACHE_SIZE = 128
+_transcript_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
 # Shared STT instance (lazy-loaded fallback)
 _local_stt = None
+# Guards _local_stt creation so concurrent calls don't each build a WhisperSTT
+_stt_lock = asyncio.Lock()
 
 
 async def get_local_stt():
     global _local_stt
     if _local_stt is None:
-        model_name = config.get("voice.stt.model", "large-v3-turbo")
-        _local_stt = WhisperSTT(model_name=model_name)
+        async with _stt_lock:
+            if _local_stt is None:
+                model_name = config.get("voice.stt.model", "large-v3-turbo")
+                # WhisperSTT() imports torch for device detection; keep it off the event loop
+                _local_stt = await asyncio.to_thread(WhisperSTT, model_name=model_name)
     return _local_stt
 
 
 async def _transcribe_via_brain(audio_path: str):
     """Спроба відправити аудіо на основний сервер AtlasBrain для економії пам'яті"""
+    global _last_brain_ok_at
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # Перевіряємо чи живий сервер
-            health = await client.get("http://127.0.0.1:8000/api/health")
-            if health.status_code == 200:
-                with open(audio_path, "rb") as f:
-                    files = {"audio": (os.path.basename(audio_path), f, "audio/wav")}
-                    response = await client.post("http://127.0.0.1:8000/api/stt", files=files)
-                    if response.status_code == 200:
-                        return response.json().get("text", "")
+        # Перевіряємо чи живий сервер (лише якщо останнє підтвердження застаріло)
+        if time.monotonic() - _last_brain_ok_at > HEALTH_TTL_S:
+            health = await _http_client.get("/api/health")
+            if health.status_code != 200:
+                return None
+            _last_brain_ok_at = time.monotonic()
+
+        # Передаємо файловий об'єкт, а не f.read(): httpx стрімить multipart
+        # частинами по 64 КБ, тож великий запис не копіюється в пам'ять повністю
+        with open(audio_path, "rb") as f:
+            files = {"audio": (os.path.basename(audio_path), f, "audio/wav")}
+            response = await _http_client.post("/api/stt", files=files)
+            if response.status_code == 200:
+                _last_brain_ok_at = time.monotonic()
+                return response.json().get("text", "")
     except Exception as e:
+        _last_brain_ok_at = 0.0
         print(f"[MCP Whisper] Brain API fallback: {e}")
     return None
 
 
+def _audio_digest(audio_path: str) -> str:
+    """Content hash of an audio file, used to recognise re-submitted clips."""
+    with open(audio_path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def _remember_transcript(key: tuple, text: str) -> None:
+    # Empty results (silence, ignored while speaking) are not worth pinning
+    if not text:
+        return
+    _transcript_cache[key] = text
+    _transcript_cache.move_to_end(key)
+    while len(_transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+        _transcript_cache.popitem(last=False)
+
+
 @server.tool()
 async def transcribe_audio(audio_path: str, language: str = None) -> str:
     """Transcribe an audio file to text. Uses Brain server if available to save VRAM."""
+    lang = language or config.get("voice.stt.language", "uk")
+
+    # 0. Same clip transcribed recently (e.g. a retry) - skip the model entirely
+    try:
+        key = (await asyncio.to_thread(_audio_digest, audio_path), lang)
+    except OSError:
+        key = None
+    if key in _transcript_cache:
+        _transcript_cache.move_to_end(key)
+        return _transcript_cache[key]
+
     # 1. Try Brain API first (Shared Memory / No duplication)
     text = await _transcribe_via_brain(audio_path)
-    if text is not None:
-        return text
-
-    # 2. Fallback to local model
-    stt = await get_local_stt()
-    lang = language or config.get("voice.stt.language", "uk")
-    result = await stt.transcribe_file(audio_path, language=lang)
-    return result.text
+    if text is None:
+        # 2. Fallback to local model
+        stt = await get_local_stt()
+        result = await stt.transcribe_file(audio_path, language=lang)
+        text = result.text
+
+    if key is not None:
+        _remember_transcript(key, text)
+    return text
 
 
 @server.tool()
@@ -0,0 +1,58 @@
+"""
+On-disk cache of MCP tool discovery results for test and diagnostic scripts.
+
+Listing tools requires a full stdio handshake with each server. Re-running the
+MCP test scripts within MCP_TOOLS_TTL seconds (default 300) reuses the last
+discovery instead. The cache key covers the server's full config (command, args,
+env), so editing the config invalidates the entry automatically.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, List
+
+from mcp.types import Tool
+
+CACHE_DIR = Path.home() / ".cache" / "atlastrinity"
+MCP_TOOLS_TTL = float(os.getenv("MCP_TOOLS_TTL", "300"))
+
+
+def _cache_path(mcp_manager, server_name: str) -> Path:
+    server_cfg = mcp_manager.config.get("mcpServers", {}).get(server_name)
+    payload = json.dumps([server_name, server_cfg], sort_keys=True, default=str)
+    key = hashlib.sha256(payload.encode()).hexdigest()
+    return CACHE_DIR / f"mcp_tools_{key}.json"
+
+
+async def cached_list_tools(mcp_manager, server_name: str) -> List[Any]:
+    """`mcp_manager.list_tools(server_name)`, served from memory or disk while fresh."""
+    # Already listed on the live session (eg. by an earlier test): no RPC, no disk read
+    tools = mcp_manager.cached_tools(server_name)
+    if tools:
+        return tools
+
+    path = _cache_path(mcp_manager, server_name)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if time.time() - data["ts"] < MCP_TOOLS_TTL:
+            return [Tool.model_validate(t) for t in data["tools"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    tools = await mcp_manager.list_tools(server_name)
+    # Empty results usually mean the server is down; don't pin that
+    if tools:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps(
+                    {"tools": [t.model_dump(mode="json") for t in tools], "ts": time.time()}
+                ),
+                encoding="utf-8",
+            )
+        except (OSError, AttributeError, TypeError):
+            pass
+    return tools
@@ -1,15 +1,45 @@
-import pytest
-
-try:
-    import torch
-except ImportError:  # pragma: no cover
-    torch = None
+import asyncio
+import functools
+import importlib.util
 import os
 import sys
+import threading
 from pathlib import Path
 
+import pytest
+import pytest_asyncio
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Heavy optional dependencies that orchestrator-level tests (test_handoff) import.
+# Stubbed once per session, and only when not installed so real packages win.
+# Set TRINITY_TEST_STUB_DEPS=0 to disable stubbing entirely.
+_HEAVY_DEP_STUBS = (
+    "langchain_core",
+    "langchain_core.messages",
+    "langgraph",
+    "langgraph.graph",
+    "ukrainian_tts",
+    "ukrainian_tts.tts",
+)
+
+
+def _stub_missing_heavy_deps() -> None:
+    from unittest.mock import MagicMock
+
+    missing = {
+        root
+        for root in {name.partition(".")[0] for name in _HEAVY_DEP_STUBS}
+        if root not in sys.modules and importlib.util.find_spec(root) is None
+    }
+    for name in _HEAVY_DEP_STUBS:
+        if name.partition(".")[0] in missing:
+            sys.modules.setdefault(name, MagicMock())
+
+
+if os.getenv("TRINITY_TEST_STUB_DEPS", "1") != "0":
+    _stub_missing_heavy_deps()
+
 from src.brain.config_loader import config  # noqa: E402
 
 # Default list of MCP servers used in tests
@@ -31,69 +61,183 @@ DEFAULT_SERVERS = [
     "docker",
 ]
 
+# Credential availability, probed once at import
+_MCP_CREDS = {
+    "github": bool(os.getenv("MCP_GITHUB_TOKEN") or os.getenv("GITHUB_TOKEN")),
+    "postgres": bool(os.getenv("MCP_POSTGRES_URL") or os.getenv("POSTGRES_URL")),
+}
+
+# Servers that need credentials are only parametrized when those are present
+MCP_TEST_SERVERS = [s for s in DEFAULT_SERVERS if _MCP_CREDS.get(s, True)]
+
+# Small per-server test cases for test_cases (sane defaults)
+_TEST_PLAN = {
+    "filesystem": [
+        {
+            "tool": "list_directory",
+            "args": {"path": "/"},
+            "description": "List root",
+        }
+    ],
+    "terminal": [
+        {
+            "tool": "execute_command",
+            "args": {"command": "echo Test"},
+            "description": "Echo command",
+        }
+    ],
+    "memory": [
+        {
+            "tool": "create_entities",
+            "args": {
+                "entities": [
+                    {
+                        "name": "test_memory",
+                        "entityType": "concept",
+                        "observations": ["Testing"],
+                    }
+                ]
+            },
+            "description": "Create entities",
+        }
+    ],
+}
+
 
 @pytest.fixture(scope="session")
 def mcp_credentials_available():
     """Check if MCP credentials are available in environment."""
-    github_token = os.getenv("MCP_GITHUB_TOKEN") or os.getenv("GITHUB_TOKEN")
-    postgres_url = os.getenv("MCP_POSTGRES_URL") or os.getenv("POSTGRES_URL")
+    return dict(_MCP_CREDS)
 
-    return {
-        "github": bool(github_token),
-        "postgres": bool(postgres_url),
-    }
 
-
-@pytest.fixture(params=DEFAULT_SERVERS)
+@pytest.fixture(params=MCP_TEST_SERVERS, ids=MCP_TEST_SERVERS)
 def server_name(request):
     """Parametrized server name for MCP tests."""
     return request.param
 
 
-@pytest.fixture(params=DEFAULT_SERVERS)
-def name(request):
-    """Alias fixture used by some tests expecting 'name'."""
-    return request.param
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def mcp():
+    """A dedicated MCPManager shared by the MCP flow/integration tests.
+
+    Connections persist across those tests and are closed once at the end of the run. It is
+    separate from the mcp_manager singleton so its session-loop connections never leak to
+    tests that run on their own loops.
+    """
+    from src.brain.mcp_manager import MCPManager
+
+    manager = MCPManager()
+    yield manager
+    await manager.cleanup()
+
+
+async def _open_mcp_session(name):
+    from src.brain.mcp_manager import mcp_manager
+
+    try:
+        return await asyncio.wait_for(mcp_manager.get_session(name), timeout=15.0)
+    except Exception:
+        return None
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def mcp_sessions():
+    """Open every MCP_TEST_SERVERS session once per test module (None where connecting failed).
+
+    Module rather than session scope: the sessions are bound to the event loop that opened
+    them, and tests elsewhere reach the same mcp_manager singleton from their own loops.
+    Under pytest-xdist a worker only runs a share of the servers, so it connects lazily.
+    """
+    from src.brain.mcp_manager import mcp_manager
+
+    names = [] if os.getenv("PYTEST_XDIST_WORKER") else MCP_TEST_SERVERS
+    sessions = await asyncio.gather(*(_open_mcp_session(name) for name in names))
+    yield dict(zip(names, sessions))
+    await mcp_manager.cleanup()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def mcp_session(server_name, mcp_sessions):
+    """Pre-opened session for the parametrized server; skips if it could not connect."""
+    if server_name not in mcp_sessions:
+        mcp_sessions[server_name] = await _open_mcp_session(server_name)
+    session = mcp_sessions[server_name]
+    if session is None:
+        pytest.skip(f"Server {server_name} unavailable")
+    return session
+
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+# Async tests run on uvloop when installed (not on Windows); TRINITY_TEST_UVLOOP=0 opts out.
+# MCP-heavy tests resolve many stdio RPC futures, which is cheaper on the C event loop.
+if uvloop is not None and sys.platform != "win32" and os.getenv("TRINITY_TEST_UVLOOP", "1") != "0":
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """`-n auto`: one worker per MCP server at most, so servers aren't spawned per idle CPU."""
+    return min(os.cpu_count() or 1, len(MCP_TEST_SERVERS))
+
+
+@pytest.fixture
+def name(server_name):
+    """Alias fixture used by some tests expecting 'name' (shares server_name's parametrization)."""
+    return server_name
 
 
 @pytest.fixture
 def test_cases(server_name):
     """Return a small set of test cases for a given server name (sane defaults)."""
-    test_plan = {
-        "filesystem": [
-            {
-                "tool": "list_directory",
-                "args": {"path": "/"},
-                "description": "List root",
-            }
-        ],
-        "terminal": [
-            {
-                "tool": "execute_command",
-                "args": {"command": "echo Test"},
-                "description": "Echo command",
-            }
-        ],
-        "memory": [
-            {
-                "tool": "create_entities",
-                "args": {
-                    "entities": [
-                        {
-                            "name": "test_memory",
-                            "entityType": "concept",
-                            "observations": ["Testing"],
-                        }
-                    ]
-                },
-                "description": "Create entities",
-            }
-        ],
-    }
-    return test_plan.get(server_name, [])
+    return _TEST_PLAN.get(server_name, [])
+
+
+@functools.cache
+def _whisper_devices():
+    # torch is imported (and MPS probed) only when a test actually asks for device_name
+    try:
+        import torch
+    except ImportError:  # pragma: no cover
+        return ["cpu"]
+    return ["cpu"] + (["mps"] if torch.backends.mps.is_available() else [])
+
+
+def _load_whisper_model():
+    from src.brain.voice.stt import WhisperSTT
 
+    try:
+        # "mps" also runs on CPU, so this warms WhisperSTT's shared model cache for both
+        asyncio.run(WhisperSTT(device="cpu").get_model())
+    except Exception:  # pragma: no cover - the test itself reports load failures
+        pass
 
-@pytest.fixture(params=["cpu"] + (["mps"] if (torch and torch.backends.mps.is_available()) else []))
-def device_name(request):
+
+@pytest.fixture(scope="session")
+def whisper_model_preload():
+    """Load the Whisper model in a background thread, once per run, for STT tests.
+
+    Overlaps the load with the rest of test setup; a test's own get_model() call then
+    waits on WhisperSTT's cache lock and reuses the model. The thread is joined on
+    teardown so a download is never cut off at exit. TRINITY_TEST_WHISPER_PRELOAD=0
+    opts out.
+    """
+    if os.getenv("TRINITY_TEST_WHISPER_PRELOAD", "1") == "0":
+        yield
+        return
+    thread = threading.Thread(target=_load_whisper_model, name="whisper-preload")
+    thread.start()
+    yield
+    thread.join()
+
+
+def pytest_generate_tests(metafunc):
     """Parametrize device_name for Whisper tests (cpu and mps if available)."""
-    return request.param
+    if "device_name" in metafunc.fixturenames:
+        metafunc.parametrize("device_name", _whisper_devices())
@@ -5,15 +5,94 @@ Tests all configured MCP servers and their capabilities.
 """
 
 import asyncio
+import io
+import itertools
 import os
 import sys
 from pathlib import Path
+from typing import Optional, TextIO
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.brain.mcp_manager import mcp_manager  # noqa: E402
+from tests._mcp_discovery_cache import cached_list_tools  # noqa: E402
+from src.brain.script_utils import run  # noqa: E402
+
+
+# Servers and tool calls exercised by main()
+TEST_PLAN = {
+    "filesystem": [
+        {
+            "tool": "list_directory",
+            "args": {"path": str(Path.home())},
+            "description": "List home directory",
+        },
+        {
+            "tool": "read_file",
+            "args": {"path": str(Path.home() / ".zshrc")},
+            "description": "Read .zshrc file",
+        },
+    ],
+    "terminal": [
+        {
+            "tool": "execute_command",
+            "args": {"command": "echo 'Test OK'"},
+            "description": "Execute echo command",
+        },
+        {
+            "tool": "execute_command",
+            "args": {"command": "pwd"},
+            "description": "Check current directory",
+        },
+        {
+            "tool": "execute_command",
+            "args": {"command": "ls -la | head -5"},
+            "description": "List files (truncated)",
+        },
+    ],
+    "github": [
+        {
+            "tool": "get_file_contents",
+            "args": {
+                "owner": "olegkizima01",
+                "repo": "atlastrinity",
+                "path": "README.md",
+            },
+            "description": "Get README.md from repo",
+        }
+    ],
+    "brave-search": [
+        {
+            "tool": "brave_web_search",
+            "args": {"query": "AtlasTrinity AI"},
+            "description": "Search web for AtlasTrinity",
+        }
+    ],
+    "memory": [
+        {
+            "tool": "create_entities",
+            "args": {
+                "entities": [
+                    {
+                        "name": "test_memory",
+                        "entityType": "concept",
+                        "observations": ["Testing MCP memory server"],
+                    }
+                ]
+            },
+            "description": "Create test memory entity",
+        }
+    ],
+    "puppeteer": [
+        {
+            "tool": "puppeteer_navigate",
+            "args": {"url": "https://example.com"},
+            "description": "Navigate to example.com",
+        }
+    ],
+}
 
 
 # Color codes for terminal output
@@ -28,8 +107,29 @@ class Colors:
     BOLD = "\033[1m"
 
 
-async def run_server_test(server_name: str, test_cases: list) -> dict:
-    """Test a single MCP server with multiple test cases. Returns graceful skips for missing servers."""
+def _truncate(obj, n: int = 200):
+    """Bounded preview of a tool result that never stringifies the whole payload."""
+    if isinstance(obj, (str, bytes)):
+        return obj[:n]
+    if isinstance(obj, dict):
+        return {k: _truncate(v, n) for k, v in itertools.islice(obj.items(), 5)}
+    if isinstance(obj, (list, tuple)):
+        return [_truncate(x, max(1, n // len(obj))) for x in obj[:5]]
+    # CallToolResult -> its content blocks; TextContent -> its text
+    if isinstance(getattr(obj, "content", None), list):
+        return _truncate(obj.content, n)
+    if isinstance(getattr(obj, "text", None), str):
+        return obj.text[:n]
+    return repr(obj)[:n]
+
+
+async def run_server_test(
+    server_name: str, test_cases: list, out: Optional[TextIO] = None
+) -> dict:
+    """Test a single MCP server with multiple test cases. Returns graceful skips for missing servers.
+
+    Output goes to `out` (stdout by default) so concurrent runs can buffer their reports.
+    """
     results = {
         "server": server_name,
         "status": "unknown",
@@ -38,33 +138,35 @@ async def run_server_test(server_name: str, test_cases: list) -> dict:
         "error": None,
     }
 
-    print(f"\n{Colors.HEADER}{'=' * 60}{Colors.ENDC}")
-    print(f"{Colors.HEADER}Testing MCP Server: {server_name}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{'=' * 60}{Colors.ENDC}\n")
+    print(f"\n{Colors.HEADER}{'=' * 60}{Colors.ENDC}", file=out)
+    print(f"{Colors.HEADER}Testing MCP Server: {server_name}{Colors.ENDC}", file=out)
+    print(f"{Colors.HEADER}{'=' * 60}{Colors.ENDC}\n", file=out)
 
     try:
         # List available tools with timeout protection
-        print(f"{Colors.OKBLUE}→ Listing tools...{Colors.ENDC}")
+        print(f"{Colors.OKBLUE}→ Listing tools...{Colors.ENDC}", file=out)
 
         try:
-            tools = await asyncio.wait_for(mcp_manager.list_tools(server_name), timeout=10.0)
+            async with asyncio.timeout(10.0):
+                # Liveness comes from a live session; only the tool listing may be cached
+                session = await mcp_manager.get_session(server_name)
+                tools = await cached_list_tools(mcp_manager, server_name) if session else []
         except asyncio.TimeoutError:
             results["status"] = "timeout"
             results["error"] = "Tool listing timeout (>10s)"
-            print(f"{Colors.WARNING}⚠ Connection timeout{Colors.ENDC}")
+            print(f"{Colors.WARNING}⚠ Connection timeout{Colors.ENDC}", file=out)
             return results
 
         if not tools:  # Empty list means server not configured or no tools
             results["status"] = "not_configured"
             results["error"] = "Server not configured or no tools available"
-            print(f"{Colors.WARNING}⚠ Server not configured or no tools{Colors.ENDC}")
+            print(f"{Colors.WARNING}⚠ Server not configured or no tools{Colors.ENDC}", file=out)
             return results
 
         results["status"] = "connected"
         results["tools"] = [t.name for t in tools]
-        print(f"{Colors.OKGREEN}✓ Found {len(tools)} tools:{Colors.ENDC}")
-        for tool in tools:
-            print(f"  • {tool.name}: {tool.description}")
+        print(f"{Colors.OKGREEN}✓ Found {len(tools)} tools:{Colors.ENDC}", file=out)
+        print("\n".join(f"  • {tool.name}: {tool.description}" for tool in tools), file=out)
 
         # Run test cases
         for test_case in test_cases:
@@ -72,8 +174,8 @@ async def run_server_test(server_name: str, test_cases: list) -> dict:
             args = test_case.get("args", {})
             description = test_case.get("description", f"Testing {tool_name}")
 
-            print(f"\n{Colors.OKBLUE}→ {description}{Colors.ENDC}")
-            print(f"  Tool: {tool_name}, Args: {args}")
+            print(f"\n{Colors.OKBLUE}→ {description}{Colors.ENDC}", file=out)
+            print(f"  Tool: {tool_name}, Args: {args}", file=out)
 
             try:
                 result = await asyncio.wait_for(
@@ -81,7 +183,7 @@ async def run_server_test(server_name: str, test_cases: list) -> dict:
                 )
 
                 if isinstance(result, dict) and "error" in result:
-                    print(f"{Colors.FAIL}✗ Error: {result['error']}{Colors.ENDC}")
+                    print(f"{Colors.FAIL}✗ Error: {result['error']}{Colors.ENDC}", file=out)
                     results["tests"].append(
                         {
                             "test": description,
@@ -91,14 +193,14 @@ async def run_server_test(server_name: str, test_cases: list) -> dict:
                     )
                 else:
                     # Truncate long output
-                    output_str = str(result)[:200]
-                    print(f"{Colors.OKGREEN}✓ Success: {output_str}...{Colors.ENDC}")
+                    output_str = str(_truncate(result))[:200]
+                    print(f"{Colors.OKGREEN}✓ Success: {output_str}...{Colors.ENDC}", file=out)
                     results["tests"].append({"test": description, "status": "success"})
             except asyncio.TimeoutError:
-                print(f"{Colors.WARNING}⚠ Tool call timeout{Colors.ENDC}")
+                print(f"{Colors.WARNING}⚠ Tool call timeout{Colors.ENDC}", file=out)
                 results["tests"].append({"test": description, "status": "timeout"})
             except Exception as e:
-                print(f"{Colors.FAIL}✗ Exception: {str(e)}{Colors.ENDC}")
+                print(f"{Colors.FAIL}✗ Exception: {str(e)}{Colors.ENDC}", file=out)
                 results["tests"].append(
                     {"test": description, "status": "exception", "error": str(e)}
                 )
@@ -106,18 +208,20 @@ async def run_server_test(server_name: str, test_cases: list) -> dict:
     except Exception as e:
         results["status"] = "connection_failed"
         results["error"] = str(e)
-        print(f"{Colors.FAIL}✗ Failed to connect: {str(e)}{Colors.ENDC}")
+        print(f"{Colors.FAIL}✗ Failed to connect: {str(e)}{Colors.ENDC}", file=out)
 
     return results
 
 
 # Pytest wrapper
-# Pytest wrapper
 
 
-@pytest.mark.asyncio
-async def test_mcp_server(server_name: str, test_cases: list):
-    """Test MCP server with timeout. Skip if server unavailable."""
+@pytest.mark.asyncio(loop_scope="module")
+async def test_mcp_server(server_name: str, test_cases: list, mcp_session):
+    """Test MCP server with timeout. Skip if server unavailable.
+
+    `mcp_session` keeps the connection opened once per run; mcp_manager reuses it.
+    """
     try:
         # Add timeout to prevent hanging on unavailable servers
         result = await asyncio.wait_for(run_server_test(server_name, test_cases), timeout=15.0)
@@ -142,97 +246,46 @@ async def test_mcp_server(server_name: str, test_cases: list):
 
 
 async def main():
-    print(f"{Colors.BOLD}{Colors.HEADER}")
+    # Bind escape codes to locals once instead of a Colors attribute lookup per print
+    G, Y, R, C = Colors.OKGREEN, Colors.WARNING, Colors.FAIL, Colors.OKCYAN
+    BANNER, E = Colors.BOLD + Colors.HEADER, Colors.ENDC
+
+    print(BANNER)
     print("╔══════════════════════════════════════════════════════════╗")
     print("║         AtlasTrinity MCP Server Test Suite              ║")
     print("╚══════════════════════════════════════════════════════════╝")
-    print(f"{Colors.ENDC}")
-
-    test_plan = {
-        "filesystem": [
-            {
-                "tool": "list_directory",
-                "args": {"path": str(Path.home())},
-                "description": "List home directory",
-            },
-            {
-                "tool": "read_file",
-                "args": {"path": str(Path.home() / ".zshrc")},
-                "description": "Read .zshrc file",
-            },
-        ],
-        "terminal": [
-            {
-                "tool": "execute_command",
-                "args": {"command": "echo 'Test OK'"},
-                "description": "Execute echo command",
-            },
-            {
-                "tool": "execute_command",
-                "args": {"command": "pwd"},
-                "description": "Check current directory",
-            },
-            {
-                "tool": "execute_command",
-                "args": {"command": "ls -la | head -5"},
-                "description": "List files (truncated)",
-            },
-        ],
-        "github": [
-            {
-                "tool": "get_file_contents",
-                "args": {
-                    "owner": "olegkizima01",
-                    "repo": "atlastrinity",
-                    "path": "README.md",
-                },
-                "description": "Get README.md from repo",
-            }
-        ],
-        "brave-search": [
-            {
-                "tool": "brave_web_search",
-                "args": {"query": "AtlasTrinity AI"},
-                "description": "Search web for AtlasTrinity",
-            }
-        ],
-        "memory": [
-            {
-                "tool": "create_entities",
-                "args": {
-                    "entities": [
-                        {
-                            "name": "test_memory",
-                            "entityType": "concept",
-                            "observations": ["Testing MCP memory server"],
-                        }
-                    ]
-                },
-                "description": "Create test memory entity",
-            }
-        ],
-        "puppeteer": [
-            {
-                "tool": "puppeteer_navigate",
-                "args": {"url": "https://example.com"},
-                "description": "Navigate to example.com",
-            }
-        ],
-    }
+    print(E)
+
+    # Test all servers concurrently (mcp_manager serializes per server, not globally).
+    # Each run writes to its own buffer; reports are printed in plan order afterwards.
+    buffers = {server_name: io.StringIO() for server_name in TEST_PLAN}
+    gathered = await asyncio.gather(
+        *(
+            run_server_test(server_name, tests, out=buffers[server_name])
+            for server_name, tests in TEST_PLAN.items()
+        ),
+        return_exceptions=True,
+    )
 
     all_results = []
-
-    for server_name, tests in test_plan.items():
-        result = await run_server_test(server_name, tests)
+    for server_name, result in zip(TEST_PLAN, gathered):
+        print(buffers[server_name].getvalue(), end="")
+        if isinstance(result, BaseException):
+            result = {
+                "server": server_name,
+                "status": "error",
+                "tools": [],
+                "tests": [],
+                "error": str(result),
+            }
         all_results.append(result)
-        await asyncio.sleep(1)  # Brief pause between servers
 
     # Summary
-    print(f"\n{Colors.BOLD}{Colors.HEADER}")
+    print(f"\n{BANNER}")
     print("╔══════════════════════════════════════════════════════════╗")
     print("║                    Test Summary                          ║")
     print("╚══════════════════════════════════════════════════════════╝")
-    print(f"{Colors.ENDC}\n")
+    print(f"{E}\n")
 
     for result in all_results:
         server = result["server"]
@@ -243,18 +296,18 @@ async def main():
             test_count = len([t for t in result["tests"] if t["status"] == "success"])
             total_tests = len(result["tests"])
             print(
-                f"{Colors.OKGREEN}✓ {server:20} | {tool_count} tools | {test_count}/{total_tests} tests passed{Colors.ENDC}"
+                f"{G}✓ {server:20} | {tool_count} tools | {test_count}/{total_tests} tests passed{E}"
             )
         elif status == "no_tools":
-            print(f"{Colors.WARNING}⚠ {server:20} | Connected but no tools{Colors.ENDC}")
+            print(f"{Y}⚠ {server:20} | Connected but no tools{E}")
         else:
             error = result.get("error", "Unknown error")
-            print(f"{Colors.FAIL}✗ {server:20} | {error[:40]}...{Colors.ENDC}")
+            print(f"{R}✗ {server:20} | {error[:40]}...{E}")
 
     # Cleanup
     await mcp_manager.cleanup()
-    print(f"\n{Colors.OKCYAN}Test suite completed.{Colors.ENDC}\n")
+    print(f"\n{C}Test suite completed.{E}\n")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
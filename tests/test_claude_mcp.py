@@ -1,73 +1,93 @@
 import asyncio
+import io
 import os
 import sys
 
 sys.path.append(os.path.abspath(os.getcwd()))
 from src.brain.mcp_manager import mcp_manager  # noqa: E402
+from tests._mcp_discovery_cache import cached_list_tools  # noqa: E402
+from src.brain.script_utils import run  # noqa: E402
 
 
-async def verify_official_mcp():
-    servers_to_test = ["filesystem", "sequential-thinking", "fetch"]
+async def _test_one(server: str) -> str:
+    """Connect, list tools and run one call against `server`; returns its report."""
+    out = io.StringIO()
+    print(f"\n--- Testing Server: {server} ---", file=out)
+    try:
+        # 1. Connect
+        session = await mcp_manager.get_session(server)
+        if not session:
+            print(f"❌ '{server}' failed to connect (check logs/npx/bunx).", file=out)
+            return out.getvalue()
+        print(f"✅ Connected to '{server}'.", file=out)
 
-    print("=== Official MCP Verification ===")
+        # 2. List tools
+        tools = await cached_list_tools(mcp_manager, server)
+        names = ", ".join(t.name for t in tools[:5])
+        suffix = "..." if len(tools) > 5 else ""
+        print(f"Found {len(tools)} tools: [{names}]{suffix}", file=out)
 
-    for server in servers_to_test:
-        print(f"\n--- Testing Server: {server} ---")
-        try:
-            # 1. Connect
-            session = await mcp_manager.get_session(server)
-            if not session:
-                print(f"❌ '{server}' failed to connect (check logs/npx/bunx).")
-                continue
-            print(f"✅ Connected to '{server}'.")
+        # 3. Simple execution test
+        if server == "filesystem":
+            # List home dir
+            res = await mcp_manager.call_tool(
+                server, "list_directory", {"path": os.path.expanduser("~")}
+            )
+            print(
+                f"Execution test (list_directory): {'SUCCESS' if not hasattr(res, 'isError') or res.isError is False else 'FAILURE'}",
+                file=out,
+            )
 
-            # 2. List tools
-            tools = await mcp_manager.list_tools(server)
+        elif server == "sequential-thinking":
+            # Start a thought
+            res = await mcp_manager.call_tool(
+                server,
+                "sequentialthinking",
+                {
+                    "thought": "Testing Claude's thinking mcp server",
+                    "thoughtNumber": 1,
+                    "totalThoughts": 1,
+                    "nextThoughtNeeded": False,
+                },
+            )
             print(
-                f"Found {len(tools)} tools: {[t.name for t in tools[:5]]}{'...' if len(tools) > 5 else ''}"
+                f"Execution test (thinking): {'SUCCESS' if not hasattr(res, 'isError') or res.isError is False else 'FAILURE'}",
+                file=out,
             )
 
-            # 3. Simple execution test
-            if server == "filesystem":
-                # List home dir
-                res = await mcp_manager.call_tool(
-                    server, "list_directory", {"path": os.path.expanduser("~")}
-                )
-                print(
-                    f"Execution test (list_directory): {'SUCCESS' if not hasattr(res, 'isError') or res.isError is False else 'FAILURE'}"
-                )
+        elif server == "fetch":
+            # Fetch a simple URL (Google)
+            res = await mcp_manager.call_tool(
+                server, "fetch_url", {"url": "https://www.google.com"}
+            )
+            print(
+                f"Execution test (fetch): {'SUCCESS' if not hasattr(res, 'isError') or res.isError is False else 'FAILURE'}",
+                file=out,
+            )
 
-            elif server == "sequential-thinking":
-                # Start a thought
-                res = await mcp_manager.call_tool(
-                    server,
-                    "sequentialthinking",
-                    {
-                        "thought": "Testing Claude's thinking mcp server",
-                        "thoughtNumber": 1,
-                        "totalThoughts": 1,
-                        "nextThoughtNeeded": False,
-                    },
-                )
-                print(
-                    f"Execution test (thinking): {'SUCCESS' if not hasattr(res, 'isError') or res.isError is False else 'FAILURE'}"
-                )
+    except Exception as e:
+        print(f"❌ Error testing '{server}': {e}", file=out)
+    return out.getvalue()
 
-            elif server == "fetch":
-                # Fetch a simple URL (Google)
-                res = await mcp_manager.call_tool(
-                    server, "fetch_url", {"url": "https://www.google.com"}
-                )
-                print(
-                    f"Execution test (fetch): {'SUCCESS' if not hasattr(res, 'isError') or res.isError is False else 'FAILURE'}"
-                )
 
-        except Exception as e:
-            print(f"❌ Error testing '{server}': {e}")
+async def verify_official_mcp():
+    servers_to_test = ["filesystem", "sequential-thinking", "fetch"]
+
+    print("=== Official MCP Verification ===")
+
+    # Servers are checked concurrently (mcp_manager serializes per server);
+    # reports are printed in declared order
+    reports = await asyncio.gather(
+        *(_test_one(server) for server in servers_to_test), return_exceptions=True
+    )
+    for server, report in zip(servers_to_test, reports):
+        if isinstance(report, BaseException):
+            report = f"\n--- Testing Server: {server} ---\n❌ Error testing '{server}': {report}\n"
+        print(report, end="")
 
     print("\n--- Cleanup ---")
     await mcp_manager.cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(verify_official_mcp())
+    run(verify_official_mcp())
@@ -24,17 +24,10 @@ async def test_grisha_real():
 
     grisha = Grisha()
 
-    # 1. Test Screenshot
+    # 1. Test Screenshot (captured in the background while the step payload is built)
     print("Step 1: Taking screenshot...")
-    screenshot_path = await grisha.take_screenshot()
-    if screenshot_path and os.path.exists(screenshot_path):
-        print(f"Screenshot saved to: {screenshot_path}")
-    else:
-        print("Screenshot FAILED")
-        return
+    shot_task = asyncio.create_task(grisha.take_screenshot())
 
-    # 2. Test Verification
-    print("Step 2: Verifying step...")
     mock_step = {
         "id": 1,
         "action": "Check if a file exists",
@@ -48,6 +41,15 @@ async def test_grisha_real():
         "output": "File 'test.txt' found.",
     }
 
+    screenshot_path = await shot_task
+    if screenshot_path and os.path.exists(screenshot_path):
+        print(f"Screenshot saved to: {screenshot_path}")
+    else:
+        print("Screenshot FAILED")
+        return
+
+    # 2. Test Verification
+    print("Step 2: Verifying step...")
     try:
         verification = await grisha.verify_step(
             step=mock_step, result=mock_result, screenshot_path=screenshot_path
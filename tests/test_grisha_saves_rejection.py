@@ -1,10 +1,27 @@
+import asyncio
+
 import pytest
+import pytest_asyncio
 
 from brain.agents.grisha import Grisha, VerificationResult
 from brain.mcp_manager import mcp_manager
 
+# Test and warm-up fixture share one loop so the pre-opened sessions stay usable
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module", autouse=True)
+async def _warm_sessions():
+    """Open the notes and memory sessions before the test body runs."""
+    await asyncio.gather(
+        mcp_manager.get_session("notes"),
+        mcp_manager.get_session("memory"),
+        return_exceptions=True,
+    )
+    yield
+    await mcp_manager.cleanup()
+
 
-@pytest.mark.asyncio
 async def test_grisha_saves_rejection_report():
     gr = Grisha()
     step = {"id": 999, "action": "Fake action", "expected_result": "Expect"}
@@ -20,14 +37,12 @@ async def test_grisha_saves_rejection_report():
     # Call internal save method
     await gr._save_rejection_report(999, step, verification)
 
-    # Check notes
-    notes_search = await mcp_manager.call_tool(
-        "notes", "search_notes", {"tags": ["step_999"], "limit": 5}
+    # Check notes and memory entity (independent servers, queried together)
+    notes_search, mem = await asyncio.gather(
+        mcp_manager.call_tool("notes", "search_notes", {"tags": ["step_999"], "limit": 5}),
+        mcp_manager.call_tool("memory", "get_entity", {"name": "grisha_rejection_step_999"}),
     )
     assert notes_search is not None
-
-    # Check memory entity
-    mem = await mcp_manager.call_tool("memory", "get_entity", {"name": "grisha_rejection_step_999"})
     assert mem is not None
     # ensure memory entity contains observations
     if hasattr(mem, "content"):
@@ -3,14 +3,7 @@ import os
 import sys
 from unittest.mock import MagicMock
 
-# Mock modules
-sys.modules["langchain_core"] = MagicMock()
-sys.modules["langchain_core.messages"] = MagicMock()
-sys.modules["langgraph"] = MagicMock()
-sys.modules["langgraph.graph"] = MagicMock()
-# Mock TTS availability
-sys.modules["ukrainian_tts"] = MagicMock()
-sys.modules["ukrainian_tts.tts"] = MagicMock()
+# langchain/langgraph/ukrainian_tts stubs (when not installed) come from conftest.py
 
 # Add src path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
@@ -57,14 +50,18 @@ class MockGrisha:
         raise RuntimeError("Simulated Crash in Grisha")
 
 
+# Stateless, so one instance of each serves every run
+_ATLAS, _TETYANA, _GRISHA = MockAtlas(), MockTetyana(), MockGrisha()
+
+
 async def test_handoff_crash():
     print("Testing Handoff Crash Resilience...")
 
     trinity = Trinity()
     # Inject mocks
-    trinity.atlas = MockAtlas()
-    trinity.tetyana = MockTetyana()
-    trinity.grisha = MockGrisha()
+    trinity.atlas = _ATLAS
+    trinity.tetyana = _TETYANA
+    trinity.grisha = _GRISHA
     trinity.voice = MagicMock()
 
     # Run
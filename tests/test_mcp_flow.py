@@ -1,26 +1,25 @@
-import asyncio
+import logging
 import os
 import sys
 
+import pytest
+
 # Add src to path. Assuming tests/ is at root, and src/ is at root.
 # Current dir: /Users/dev/Documents/GitHub/atlastrinity/tests (if we run from there) or root if we run from root.
 # We will run from root.
 sys.path.append(os.path.abspath(os.getcwd()))
 
 from src.brain.mcp_manager import mcp_manager  # noqa: E402
+from src.brain.script_utils import run  # noqa: E402
 
 
-async def test_flow():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_flow(mcp):
     print("--- 1. Testing Initialization ---")
-    # Initialize basic logging
-    import logging  # noqa: E402
-
-    logging.basicConfig(level=logging.INFO)
-
     print("--- 2. Testing Catalog Generation (with Tool Names) ---")
     # This triggers list_tools for all enabled servers
     try:
-        catalog = await mcp_manager.get_mcp_catalog()
+        catalog = await mcp.get_mcp_catalog()
         print("\nCatalog Output Preview:\n" + "=" * 40)
         print(catalog)
         print("=" * 40 + "\n")
@@ -43,7 +42,7 @@ async def test_flow():
 
         # Check if filesystem server is active in catalog
         if "filesystem" in catalog:
-            result = await mcp_manager.call_tool("filesystem", "list_directory", {"path": cwd})
+            result = await mcp.call_tool("filesystem", "list_directory", {"path": cwd})
             print(f"Execution Result: {result}")
 
             # The result from mcp python sdk is an object, usually CallToolResult
@@ -60,9 +59,16 @@ async def test_flow():
 
         traceback.print_exc()
 
-    print("\n--- Cleanup ---")
-    await mcp_manager.cleanup()
+
+async def main():
+    # Logging is configured once per script run; under pytest, its log_level option applies
+    logging.basicConfig(level=os.getenv("ATLAS_TEST_LOG", "INFO").upper())
+    try:
+        await test_flow(mcp_manager)
+    finally:
+        print("\n--- Cleanup ---")
+        await mcp_manager.cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(test_flow())
+    run(main())
@@ -1,8 +1,9 @@
 import asyncio
+import functools
 import json
 import os
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Optional, Set
 
 import pytest
 
@@ -29,45 +30,49 @@ def _selected_servers() -> Optional[Set[str]]:
     return {s.strip() for s in raw.split(",") if s.strip()}
 
 
-def _missing_required_env_vars(server_cfg: dict) -> List[str]:
-    missing: List[str] = []
-    env = server_cfg.get("env") or {}
-    for _, v in env.items():
-        if isinstance(v, str) and v.startswith("${") and v.endswith("}"):
-            env_name = v[2:-1]
-            if not os.getenv(env_name):
-                missing.append(env_name)
+def _missing_required_env_vars(server_cfg: dict, env_keys: Set[str]) -> Set[str]:
+    """`${VAR}` placeholders in a server's env values and args that are unset or empty.
 
+    env_keys is a snapshot of the non-empty variable names, taken once per run.
+    """
     args = server_cfg.get("args") or []
+    values = list((server_cfg.get("env") or {}).values())
     if isinstance(args, list):
-        for v in args:
-            if isinstance(v, str) and v.startswith("${") and v.endswith("}"):
-                env_name = v[2:-1]
-                if not os.getenv(env_name):
-                    missing.append(env_name)
-    return missing
+        values += args
+    return {
+        v[2:-1]
+        for v in values
+        if isinstance(v, str) and v.startswith("${") and v.endswith("}") and v[2:-1] not in env_keys
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_mcp_config(path: str, mtime_ns: int) -> dict:
+    # mtime_ns is part of the cache key only: editing the file re-parses it
+    return json.loads(Path(path).read_text(encoding="utf-8"))
 
 
 def _load_global_mcp_config() -> dict:
     cfg_path = Path.home() / ".config" / "atlastrinity" / "mcp" / "config.json"
-    if not cfg_path.exists():
+    try:
+        mtime_ns = cfg_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
-    return json.loads(cfg_path.read_text(encoding="utf-8"))
+    return _parse_mcp_config(str(cfg_path), mtime_ns)
 
 
 @pytest.mark.skipif(
     not _integration_enabled(),
     reason="Set TRINITY_INTEGRATION=1 to run real MCP integration tests",
 )
-def test_mcp_servers_connect_and_list_tools():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_mcp_servers_connect_and_list_tools(mcp):
     if not _mcp_package_available():
         pytest.skip("Python package 'mcp' is not installed")
 
-    from src.brain.mcp_manager import MCPManager
+    from src.brain.script_utils import configured_servers
 
-    base_mgr = MCPManager()
-    servers = base_mgr.config.get("mcpServers", {}) or {}
-    server_names = [name for name in servers.keys() if not name.startswith("_")]
+    server_names = list(configured_servers(mcp))
 
     selected = _selected_servers()
     if selected is not None:
@@ -75,36 +80,44 @@ def test_mcp_servers_connect_and_list_tools():
 
     assert server_names, "No enabled MCP servers configured."
 
-    async def _run() -> None:
-        for name in sorted(server_names):
+    # One shared manager (the session-scoped `mcp` fixture); servers connect concurrently,
+    # bounded so a large config doesn't spawn every server at once
+    sem = asyncio.Semaphore(int(os.getenv("TRINITY_INTEGRATION_CONCURRENCY", "6")))
+    # Set variables, snapshotted once for all servers' placeholder checks
+    env_keys = {k for k, v in os.environ.items() if v}
+
+    async def _one(name: str) -> Optional[str]:
+        """Connect to and list tools of one server; returns a failure message or None."""
+        server_cfg = (mcp.config.get("mcpServers", {}) or {}).get(name) or {}
+        timeout = float(server_cfg.get("connect_timeout", 30.0))
+
+        missing_env = _missing_required_env_vars(server_cfg, env_keys)
+        if missing_env:
+            return (
+                f"Missing required env vars for {name}: {sorted(missing_env)}. "
+                "Add them to ~/.config/atlastrinity/.env or export them in your shell."
+            )
+
+        async with sem:
             print(f"\n--> Testing server: {name}")
-
-            mgr = MCPManager()
             try:
-                server_cfg = (mgr.config.get("mcpServers", {}) or {}).get(name) or {}
-                timeout = float(server_cfg.get("connect_timeout", 30.0))
-
-                missing_env = _missing_required_env_vars(server_cfg)
-                if missing_env:
-                    pytest.fail(
-                        f"Missing required env vars for {name}: {sorted(set(missing_env))}. "
-                        "Add them to ~/.config/atlastrinity/.env or export them in your shell."
-                    )
-
-                session = await asyncio.wait_for(mgr.get_session(name), timeout=timeout + 5.0)
-                if session is None:
-                    pytest.fail(f"Could not connect to MCP server: {name}")
-
-                tools = await asyncio.wait_for(mgr.list_tools(name), timeout=timeout + 10.0)
-                assert isinstance(
-                    tools, list
-                ), f"Expected list of tools from {name}, got {type(tools).__name__}"
-                assert len(tools) > 0, f"No tools returned by {name}"
-                print(f"<-- OK: {name} connected, {len(tools)} tools found.")
-            finally:
-                try:
-                    await mgr.cleanup()
-                except Exception:
-                    pass
-
-    asyncio.run(_run())
+                # One deadline covers connect + list_tools (list_tools needs the session first)
+                async with asyncio.timeout(timeout + 15.0):
+                    session = await mcp.get_session(name)
+                    if session is None:
+                        return f"Could not connect to MCP server: {name}"
+
+                    tools = await mcp.list_tools(name)
+            except asyncio.TimeoutError:
+                return f"Timed out connecting to MCP server: {name}"
+
+        if not isinstance(tools, list):
+            return f"Expected list of tools from {name}, got {type(tools).__name__}"
+        if not tools:
+            return f"No tools returned by {name}"
+        print(f"<-- OK: {name} connected, {len(tools)} tools found.")
+        return None
+
+    failures = [f for f in await asyncio.gather(*(_one(n) for n in server_names)) if f]
+    if failures:
+        pytest.fail("\n".join(failures))
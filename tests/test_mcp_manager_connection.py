@@ -2,8 +2,6 @@ import asyncio
 from contextlib import asynccontextmanager
 from types import SimpleNamespace
 
-import pytest
-
 from src.brain.mcp_manager import MCPManager
 
 
@@ -41,7 +39,6 @@ class FakeClientSession:
         return SimpleNamespace(tools=["a", "b"])
 
 
-@pytest.mark.asyncio
 async def test_connect_and_cleanup(monkeypatch):
     mm = MCPManager()
 
@@ -67,3 +64,34 @@ async def test_connect_and_cleanup(monkeypatch):
     # cleanup should close remaining connection tasks
     await mm.cleanup()
     assert mm.get_status()["session_count"] == 0
+
+
+async def test_cancelled_first_caller_keeps_connecting(monkeypatch):
+    mm = MCPManager(preloaded_config={})
+    release = asyncio.Event()
+
+    class SlowSession(FakeClientSession):
+        async def initialize(self):
+            await release.wait()
+
+    monkeypatch.setattr("src.brain.mcp_manager.stdio_client", fake_stdio_client)
+    monkeypatch.setattr("src.brain.mcp_manager.ClientSession", SlowSession)
+    server_cfg = {"command": "echo", "args": []}
+
+    first = asyncio.create_task(mm._connect_server("slow", server_cfg))
+    await asyncio.sleep(0)
+    joiner = asyncio.create_task(mm._connect_server("slow", server_cfg))
+    await asyncio.sleep(0)
+
+    # The first caller giving up (eg. a short wait_for on a cold start) must neither
+    # tear down the connection nor leak its cancellation into the joiner
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not joiner.done()
+
+    release.set()
+    session = await joiner
+    assert session is not None
+    assert mm.sessions["slow"] is session
+
+    await mm.cleanup()
@@ -0,0 +1,209 @@
+import os
+from types import SimpleNamespace
+
+import src.brain.mcp_manager as mm
+from src.brain.mcp_manager import MCPManager
+
+
+class _Session:
+    def __init__(self, ping_error=None):
+        self.ping_error = ping_error
+        self.calls = []
+
+    async def send_ping(self):
+        self.calls.append("ping")
+        if self.ping_error:
+            raise self.ping_error
+
+    async def list_tools(self):
+        self.calls.append("list_tools")
+        return SimpleNamespace(tools=[])
+
+
+class _MethodNotFound(Exception):
+    error = SimpleNamespace(code=-32601)
+
+
+async def test_health_check_prefers_ping():
+    manager = MCPManager(preloaded_config={})
+    session = _Session()
+    manager.sessions["foo"] = session
+
+    assert await manager.health_check("foo") is True
+    assert session.calls == ["ping"]
+    assert manager.health_check_method_used["foo"] == "ping"
+
+
+async def test_health_check_falls_back_when_ping_unsupported():
+    manager = MCPManager(preloaded_config={})
+    session = _Session(ping_error=_MethodNotFound())
+    manager.sessions["foo"] = session
+
+    assert await manager.health_check("foo") is True
+    assert session.calls == ["ping", "list_tools"]
+    assert manager.health_check_method_used["foo"] == "list_tools"
+
+
+async def test_health_check_ping_failure_is_unhealthy():
+    manager = MCPManager(preloaded_config={})
+    session = _Session(ping_error=ConnectionError("closed"))
+    manager.sessions["foo"] = session
+
+    assert await manager.health_check("foo") is False
+    assert session.calls == ["ping"]
+
+
+async def test_check_and_restart_restarts_unhealthy(monkeypatch):
+    manager = MCPManager(preloaded_config={})
+    restarted = []
+
+    async def fake_health(name):
+        return name != "bad"
+
+    async def fake_restart(name):
+        restarted.append(name)
+        return True
+
+    monkeypatch.setattr(manager, "health_check", fake_health)
+    monkeypatch.setattr(manager, "restart_server", fake_restart)
+
+    await manager._check_and_restart("good")
+    await manager._check_and_restart("bad")
+    assert restarted == ["bad"]
+
+
+async def test_list_tools_cached_per_session(monkeypatch):
+    manager = MCPManager(preloaded_config={})
+    sessions = manager.sessions
+    sessions["foo"] = _Session()
+
+    async def fake_get_session(name):
+        return sessions[name]
+
+    monkeypatch.setattr(manager, "get_session", fake_get_session)
+
+    await manager.list_tools("foo")
+    await manager.list_tools("foo")
+    assert sessions["foo"].calls == ["list_tools"]
+
+    assert manager.cached_tools("foo") == []
+    # A reconnect yields a new session object, which invalidates the cache
+    sessions["foo"] = _Session()
+    assert manager.cached_tools("foo") is None
+    await manager.list_tools("foo")
+    assert sessions["foo"].calls == ["list_tools"]
+
+
+async def test_iter_tools_follows_cursor_and_stops_at_limit(monkeypatch):
+    manager = MCPManager(preloaded_config={})
+    pages = {None: (["a", "b"], "p2"), "p2": (["c", "d"], "p3"), "p3": (["e"], None)}
+    cursors = []
+
+    class _PagedSession:
+        async def list_tools(self, cursor=None):
+            cursors.append(cursor)
+            tools, next_cursor = pages[cursor]
+            return SimpleNamespace(tools=tools, nextCursor=next_cursor)
+
+    session = _PagedSession()
+
+    async def fake_get_session(name):
+        return session
+
+    monkeypatch.setattr(manager, "get_session", fake_get_session)
+    manager.sessions["foo"] = session
+
+    assert [t async for t in manager.iter_tools("foo", limit=3)] == ["a", "b", "c"]
+    assert cursors == [None, "p2"]
+    assert manager.cached_tools("foo") is None
+
+    # A full enumeration fills the list_tools() cache
+    assert [t async for t in manager.iter_tools("foo")] == ["a", "b", "c", "d", "e"]
+    assert manager.cached_tools("foo") == ["a", "b", "c", "d", "e"]
+    cursors.clear()
+    assert [t async for t in manager.iter_tools("foo", limit=2)] == ["a", "b"]
+    assert cursors == []
+
+
+async def test_mcp_catalog_reused_until_connections_change(monkeypatch):
+    manager = MCPManager(preloaded_config={"mcpServers": {"foo": {"description": "Foo"}}})
+    calls = []
+
+    async def fake_list_tools(name):
+        calls.append(name)
+        return [SimpleNamespace(name="do_foo")]
+
+    monkeypatch.setattr(manager, "list_tools", fake_list_tools)
+
+    first = await manager.get_mcp_catalog()
+    assert "(Tools: do_foo)" in first
+    assert await manager.get_mcp_catalog() == first
+    assert calls == ["foo"]
+
+    manager.sessions["foo"] = _Session()
+    assert "[CONNECTED] foo" in await manager.get_mcp_catalog()
+    assert calls == ["foo", "foo"]
+
+
+async def test_mcp_catalog_not_cached_when_a_server_fails(monkeypatch):
+    manager = MCPManager(preloaded_config={"mcpServers": {"down": {}, "empty": {}}})
+    manager.sessions["empty"] = session = _Session()
+    calls = []
+
+    async def fake_list_tools(name):
+        calls.append(name)
+        if name == "empty":
+            # A live server with no tools is cached like any other result
+            manager._tools_cache[name] = (session, [])
+        # "down": list_tools() swallows the error and returns []
+        return []
+
+    monkeypatch.setattr(manager, "list_tools", fake_list_tools)
+
+    await manager.get_mcp_catalog()
+    await manager.get_mcp_catalog()
+    assert calls.count("down") == 2
+
+
+async def test_call_tools_batch_keeps_order_and_maps_errors(monkeypatch):
+    manager = MCPManager(preloaded_config={})
+
+    async def fake_call_tool(server, tool, args=None):
+        if server == "bad":
+            raise RuntimeError("boom")
+        return {"server": server, "tool": tool, "args": args}
+
+    monkeypatch.setattr(manager, "call_tool", fake_call_tool)
+
+    results = await manager.call_tools_batch(
+        [("notes", "search_notes", {"limit": 1}), ("bad", "x", None), ("memory", "search_nodes", {})]
+    )
+    assert results[0] == {"server": "notes", "tool": "search_notes", "args": {"limit": 1}}
+    assert results[1] == {"error": "boom"}
+    assert results[2]["server"] == "memory"
+
+
+def test_preloaded_config_is_not_mutated():
+    raw = {"mcpServers": {"foo": {"command": "${MISSING_TEST_VAR}"}, "off": {"disabled": True}}}
+    a = MCPManager(preloaded_config=raw)
+    b = MCPManager(preloaded_config=raw)
+
+    assert "foo" in a.config["mcpServers"] and "off" not in a.config["mcpServers"]
+    assert a.config["mcpServers"]["foo"] is not b.config["mcpServers"]["foo"]
+    assert raw["mcpServers"]["foo"] == {"command": "${MISSING_TEST_VAR}"}
+
+
+def test_reload_config_only_when_file_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr(mm, "MCP_DIR", tmp_path)
+    path = tmp_path / "config.json"
+    path.write_text('{"mcpServers": {"foo": {"command": "a"}}}', encoding="utf-8")
+    manager = MCPManager()
+    assert "foo" in manager.config["mcpServers"]
+
+    assert manager.reload_config_if_changed() is False
+
+    path.write_text('{"mcpServers": {"bar": {"command": "b"}}}', encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert manager.reload_config_if_changed() is True
+    assert list(manager.config["mcpServers"]) == ["_defaults", "bar"]
@@ -6,7 +6,17 @@ import pytest
 from src.brain.mcp_manager import MCPManager
 
 
-@pytest.mark.asyncio
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    """Collapse restart backoff sleeps to a bare yield so retries cost no wall-clock time."""
+    real_sleep = asyncio.sleep
+
+    async def no_wait(delay, *args, **kwargs):
+        await real_sleep(0)
+
+    monkeypatch.setattr("src.brain.mcp_manager.asyncio.sleep", no_wait)
+
+
 async def test_restart_retry_success(monkeypatch):
     manager = MCPManager()
     manager.config = {"mcpServers": {"foo": {}}}
@@ -24,7 +34,6 @@ async def test_restart_retry_success(monkeypatch):
     assert calls["n"] == 3
 
 
-@pytest.mark.asyncio
 async def test_restart_retry_fail(monkeypatch):
     manager = MCPManager()
     manager.config = {"mcpServers": {"bar": {}}}
@@ -2,8 +2,10 @@ import json
 import subprocess
 from pathlib import Path
 
+import httpx
 import pytest
 
+from src.brain import mcp_preflight
 from src.brain.mcp_preflight import (
     _parse_package_arg,
     bunx_package_exists,
@@ -21,6 +23,14 @@ class DummyCompleted:
         self.stderr = err
 
 
+@pytest.fixture(autouse=True)
+def _clear_registry_caches():
+    """Registry lookups are memoized per process; each test fakes its own responses."""
+    mcp_preflight._npm_view_has_version.cache_clear()
+    mcp_preflight._registry_has_version.cache_clear()
+    yield
+
+
 def test_parse_package_arg_simple():
     assert _parse_package_arg("pkg@1.2.3") == ("pkg", "1.2.3")
     assert _parse_package_arg("@scope/pkg@2025.12.18") == ("@scope/pkg", "2025.12.18")
@@ -43,110 +53,89 @@ def test_npm_package_exists_not_found(monkeypatch):
     assert not npm_package_exists("pkg", "0.0.0")
 
 
-def test_check_package_arg_for_tool_npx(monkeypatch):
-    import urllib
+def test_npm_package_exists_only_memoizes_definitive_answers(monkeypatch):
+    results = [(1, "", "ETIMEDOUT"), (1, "", "npm error code E404"), (1, "", "ETIMEDOUT")]
+    calls = []
 
-    # Simulate registry returning version object for pkg@1.0.0 and 404 for pkg@0.0.1
-    def fake_registry(req, timeout):
-        url = req.get_full_url() if hasattr(req, "get_full_url") else str(req)
+    def fake_run_cmd(cmd, timeout=10):
+        calls.append(cmd)
+        return results[len(calls) - 1]
+
+    monkeypatch.setattr(mcp_preflight, "_run_cmd", fake_run_cmd)
+    # A timeout is retried on the next check; the E404 that follows is kept
+    assert not npm_package_exists("pkg", "1.0.0")
+    assert not npm_package_exists("pkg", "1.0.0")
+    assert not npm_package_exists("pkg", "1.0.0")
+    assert len(calls) == 2
 
-        class R:
-            status = 200
 
-            def read(self):
-                return b"{}"
+def _fake_registry(monkeypatch, handler):
+    """Route registry GETs on the shared preflight client to handler(path) -> httpx.Response."""
+    calls = []
 
-            def __enter__(self):
-                return self
+    def fake_get(path, **kwargs):
+        calls.append(path)
+        resp = handler(path)
+        resp.request = httpx.Request("GET", f"https://registry.npmjs.org{path}")
+        return resp
 
-            def __exit__(self, exc_type, exc, tb):
-                return False
+    monkeypatch.setattr(mcp_preflight._CLIENT, "get", fake_get)
+    return calls
 
-        if "pkg/1.0.0" in url:
-            return R()
-        raise urllib.error.HTTPError(url, 404, "Not found", hdrs=None, fp=None)
 
-    monkeypatch.setattr(urllib.request, "urlopen", fake_registry)
+def test_check_package_arg_for_tool_npx(monkeypatch):
+    # Simulate registry returning version object for pkg@1.0.0 and 404 for pkg@0.0.1
+    _fake_registry(
+        monkeypatch,
+        lambda path: httpx.Response(200 if path == "/pkg/1.0.0" else 404, json={}),
+    )
     assert check_package_arg_for_tool("pkg@1.0.0", tool_cmd="npx")
     assert not check_package_arg_for_tool("pkg@0.0.1", tool_cmd="npx")
 
 
 def test_bunx_package_exists_registry(monkeypatch):
     # simulate registry returning 200 for bun package version endpoint
-    import urllib
-
-    def fake_registry(url, timeout):
-        class R:
-            status = 200
-
-            def read(self):
-                return b"{}"
-
-            def __enter__(self):
-                return self
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-        return R()
-
-    monkeypatch.setattr(urllib.request, "urlopen", fake_registry)
+    _fake_registry(monkeypatch, lambda path: httpx.Response(200, json={}))
     assert bunx_package_exists("somepkg", "1.0.0")
 
 
 def test_bunx_package_not_exists(monkeypatch):
-    import urllib
-
-    def fake_registry(url, timeout):
-        raise urllib.error.HTTPError(url, 404, "Not found", hdrs=None, fp=None)
-
-    monkeypatch.setattr(urllib.request, "urlopen", fake_registry)
+    _fake_registry(monkeypatch, lambda path: httpx.Response(404))
     assert not bunx_package_exists("otherpkg", "0.0.1")
 
 
 def test_npm_registry_latest(monkeypatch):
-    import urllib
-
-    # Prepare fake package metadata with dist-tags.latest
-    def fake_registry_meta(url, timeout):
-        class R:
-            status = 200
-
-            def read(self):
-                return b'{"dist-tags": {"latest": "1.2.3"}, "versions": {"1.2.3": {}}}'
+    # dist-tags.latest resolves to a published version
+    def registry(path):
+        if path.endswith("/dist-tags"):
+            return httpx.Response(200, json={"latest": "1.2.3"})
+        return httpx.Response(200 if path == "/somepkg/1.2.3" else 404, json={})
 
-            def __enter__(self):
-                return self
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-        return R()
-
-    monkeypatch.setattr(urllib.request, "urlopen", fake_registry_meta)
+    _fake_registry(monkeypatch, registry)
     assert npm_registry_has_version("somepkg", "latest")
 
 
-def test_check_package_arg_for_tool_latest(monkeypatch):
-    import urllib
-
-    def fake_registry_meta(url, timeout):
-        class R:
-            status = 200
+def test_npm_registry_tag_unpublished_version(monkeypatch):
+    def registry(path):
+        if path.endswith("/dist-tags"):
+            return httpx.Response(200, json={"latest": "9.9.9"})
+        return httpx.Response(404)
 
-            def read(self):
-                return b'{"dist-tags": {"latest": "2.0.0"}, "versions": {"2.0.0": {}}}'
+    _fake_registry(monkeypatch, registry)
+    assert not npm_registry_has_version("somepkg", "latest")
+    assert not npm_registry_has_version("somepkg", "beta")
 
-            def __enter__(self):
-                return self
 
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-        return R()
+def test_check_package_arg_for_tool_latest(monkeypatch):
+    def registry(path):
+        if path.endswith("/dist-tags"):
+            return httpx.Response(200, json={"latest": "2.0.0"})
+        return httpx.Response(200, json={})
 
-    monkeypatch.setattr(urllib.request, "urlopen", fake_registry_meta)
+    calls = _fake_registry(monkeypatch, registry)
     assert check_package_arg_for_tool("@scope/pkg@latest", tool_cmd="npx")
+    # Only the small dist-tags document is fetched, never the full package metadata
+    assert calls == ["/-/package/%40scope%2Fpkg/dist-tags", "/%40scope%2Fpkg/2.0.0"]
 
 
 def test_scan_mcp_config_for_package_issues(tmp_path, monkeypatch):
@@ -163,41 +152,11 @@ def test_scan_mcp_config_for_package_issues(tmp_path, monkeypatch):
     p = tmp_path / "mcp.json"
     p.write_text(json.dumps(cfg))
 
-    def fake_run(cmd, capture_output, text, timeout):
-        if "pkg@1.0.0" in cmd:
-            return DummyCompleted(rc=0, out="1.0.0\n")
-        if "otherpkg@0.0.1" in cmd:
-            return DummyCompleted(rc=1, out="")
-        return DummyCompleted(rc=1, out="")
-
-    monkeypatch.setattr(subprocess, "run", fake_run)
-
-    # Also monkeypatch registry HTTP for bunx check: return 404 for otherpkg
-    class FakeHTTPError(Exception):
-        pass
-
-    def fake_registry(req, timeout):
-        url = req.get_full_url() if hasattr(req, "get_full_url") else str(req)
-        if "otherpkg" in url:
-            raise urllib.error.HTTPError(url, 404, "Not found", hdrs=None, fp=None)
-
-        class R:
-            status = 200
-
-            def read(self):
-                return b"{}"
-
-            def __enter__(self):
-                return self
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-        return R()
-
-    import urllib
-
-    monkeypatch.setattr(urllib.request, "urlopen", fake_registry)
+    # Registry: 404 for otherpkg (bunx check), 200 for everything else
+    _fake_registry(
+        monkeypatch,
+        lambda path: httpx.Response(404 if "otherpkg" in path else 200, json={}),
+    )
 
     issues = scan_mcp_config_for_package_issues(p)
     assert len(issues) == 1
@@ -248,3 +207,21 @@ def test_scan_mcp_config_for_python_present(tmp_path, monkeypatch):
 
     issues = scan_mcp_config_for_package_issues(p)
     assert not any("mcp_server_docker" in s for s in issues)
+
+
+def test_npm_registry_lookup_is_memoized(monkeypatch):
+    calls = _fake_registry(monkeypatch, lambda path: httpx.Response(200, json={}))
+    assert npm_registry_has_version("pkg", "1.0.0")
+    assert npm_registry_has_version("pkg", "1.0.0")
+    assert len(calls) == 1
+
+
+def test_npm_registry_transient_error_not_memoized(monkeypatch):
+    def offline(path):
+        raise httpx.ConnectError("offline")
+
+    _fake_registry(monkeypatch, offline)
+    assert not npm_registry_has_version("pkg", "1.0.0")
+
+    _fake_registry(monkeypatch, lambda path: httpx.Response(200, json={}))
+    assert npm_registry_has_version("pkg", "1.0.0")
@@ -1,37 +1,67 @@
 import os
 import subprocess
-from unittest.mock import Mock
+from types import SimpleNamespace
 
 import pytest
 
 from scripts import setup_dev as s
 
+# Plain result sentinels: cheaper than building a Mock per subprocess.run call
+_FORMULAS_OK = SimpleNamespace(returncode=0, stdout="postgresql@17\nredis\n")
+_FAIL = SimpleNamespace(returncode=1, stdout="")
+
+
+@pytest.fixture(autouse=True)
+def _clear_brew_caches():
+    s._installed_formulas.cache_clear()
+    s._installed_casks.cache_clear()
+    yield
+    s._installed_formulas.cache_clear()
+    s._installed_casks.cache_clear()
+
 
 def test_brew_formula_installed(monkeypatch):
-    # Simulate brew list --formula returning 0
-    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: Mock(returncode=0))
+    monkeypatch.setattr(s, "_installed_formulas", lambda: frozenset({"postgresql@17"}))
     assert s._brew_formula_installed("postgresql@17")
 
-    # Simulate non-zero return
-    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: Mock(returncode=1))
+    monkeypatch.setattr(s, "_installed_formulas", lambda: frozenset({"redis"}))
     assert not s._brew_formula_installed("postgresql@17")
 
 
 def test_brew_cask_installed_brew(monkeypatch, tmp_path):
     # brew lists cask installed
-    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: Mock(returncode=0))
+    monkeypatch.setattr(s, "_installed_casks", lambda: frozenset({"docker"}))
     assert s._brew_cask_installed("docker", "Docker")
 
 
 def test_brew_cask_installed_app_path(monkeypatch, tmp_path):
     # brew reports not installed but app exists in /Applications
-    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: Mock(returncode=1))
+    monkeypatch.setattr(s, "_installed_casks", lambda: frozenset())
     # fake app path
     monkeypatch.setattr(os.path, "exists", lambda p: True if "Docker.app" in p else False)
     assert s._brew_cask_installed("docker", "Docker")
 
 
 def test_brew_cask_not_installed(monkeypatch, tmp_path):
-    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: Mock(returncode=1))
+    monkeypatch.setattr(s, "_installed_casks", lambda: frozenset())
     monkeypatch.setattr(os.path, "exists", lambda p: False)
     assert not s._brew_cask_installed("docker", "Docker")
+
+
+def test_installed_formulas_single_brew_call(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return _FORMULAS_OK
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    assert s._brew_formula_installed("postgresql@17")
+    assert s._brew_formula_installed("redis")
+    assert not s._brew_formula_installed("node")
+    assert calls == [["brew", "list", "--formula", "-1"]]
+
+
+def test_installed_casks_brew_failure_is_empty(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: _FAIL)
+    assert s._installed_casks() == frozenset()
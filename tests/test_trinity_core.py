@@ -5,17 +5,39 @@ Tests Atlas, Orchestrator, and core Trinity functionality
 """
 
 import asyncio
+import json
 import sys
+import timeit
 from pathlib import Path
 
 import pytest
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - e.g. PyPy, which has no orjson wheels
+    orjson = None
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.brain.agents.atlas import Atlas, TaskPlan  # noqa: E402
+from src.brain.agents.atlas import Atlas, TaskPlan, _conversational_kind  # noqa: E402
 from src.brain.context import shared_context  # noqa: E402
 
 
+@pytest.fixture(scope="module")
+def _shared_atlas():
+    """One Atlas per module: construction builds the LLM client and loads config."""
+    return Atlas()
+
+
+@pytest.fixture
+def atlas(_shared_atlas, monkeypatch):
+    """The shared Atlas with per-test state reset; a swapped-in `llm` is restored afterwards."""
+    monkeypatch.setattr(_shared_atlas, "llm", _shared_atlas.llm)
+    _shared_atlas.history.clear()
+    _shared_atlas.current_plan = None
+    return _shared_atlas
+
+
 class TestAtlasCore:
     """Test core Atlas functionality"""
 
@@ -29,29 +51,25 @@ class TestAtlasCore:
         assert atlas.current_plan is None
         assert isinstance(atlas.history, list)
 
+    @pytest.mark.parametrize("greeting", ["привіт", "здоров", "як справи", "як ти", "дякую", "hi"])
     @pytest.mark.asyncio
-    async def test_atlas_chat_detection_greetings(self):
+    async def test_atlas_chat_detection_greetings(self, atlas, greeting):
         """Test Atlas correctly detects greetings"""
-        atlas = Atlas()
-
-        test_cases = [
-            "привіт",
-            "здоров",
-            "як справи",
-            "як ти",
-            "дякую",
-            "hi",
-        ]
-
-        for greeting in test_cases:
-            result = await atlas.analyze_request(greeting)
-            assert result["intent"] == "chat", f"Failed for: {greeting}"
-            assert "initial_response" in result
+        result = await atlas.analyze_request(greeting)
+        assert result["intent"] == "chat", f"Failed for: {greeting}"
+        assert "initial_response" in result
+
+    @pytest.mark.parametrize(
+        "request_lower, kind",
+        [("як справи?", "how_are_you"), ("ок", "greeting"), ("show history", None)],
+    )
+    def test_conversational_kind(self, request_lower, kind):
+        """Heuristic classification, with English words matched on word boundaries"""
+        assert _conversational_kind(request_lower) == kind
 
     @pytest.mark.asyncio
-    async def test_atlas_task_detection(self):
+    async def test_atlas_task_detection(self, atlas):
         """Test Atlas correctly detects tasks"""
-        atlas = Atlas()
 
         # Mock LLM response
         class MockLLM:
@@ -68,9 +86,8 @@ class TestAtlasCore:
         assert result["initial_response"] is None
 
     @pytest.mark.asyncio
-    async def test_atlas_error_handling(self):
+    async def test_atlas_error_handling(self, atlas):
         """Test Atlas handles LLM errors gracefully"""
-        atlas = Atlas()
 
         # Mock failing LLM
         class FailingLLM:
@@ -86,9 +103,8 @@ class TestAtlasCore:
         result2 = await atlas.analyze_request("відкрий terminal")
         assert result2["intent"] == "task"
 
-    def test_atlas_voice_messages(self):
+    def test_atlas_voice_messages(self, atlas):
         """Test Atlas generates correct voice messages"""
-        atlas = Atlas()
 
         msg1 = atlas.get_voice_message("plan_created", steps=5)
         assert "5 пунктів" in msg1
@@ -96,9 +112,8 @@ class TestAtlasCore:
         msg2 = atlas.get_voice_message("delegating")
         assert "Тетяно" in msg2
 
-    def test_atlas_response_parsing(self):
+    def test_atlas_response_parsing(self, atlas):
         """Test JSON response parsing"""
-        atlas = Atlas()
 
         # Valid JSON
         json_str = '{"key": "value", "number": 42}'
@@ -111,6 +126,13 @@ class TestAtlasCore:
         result2 = atlas._parse_response(text_with_json)
         assert result2["embedded"] is True
 
+        # Braces in surrounding prose, and braces inside JSON strings
+        result4 = atlas._parse_response('Use {name}: {"a": {"b": "}{"}} then {z}')
+        assert result4 == {"a": {"b": "}{"}}
+
+        # Several objects: the first one wins
+        assert atlas._parse_response('{"first": 1} and {"second": 2}') == {"first": 1}
+
         # Invalid JSON
         result3 = atlas._parse_response("Not JSON at all")
         assert "raw" in result3
@@ -156,22 +178,26 @@ class TestTaskPlan:
 class TestPerformance:
     """Test performance characteristics"""
 
+    # Built once per class, not per run
+    _data = {"data": list(range(1000))}
+    large_json = (
+        orjson.dumps(_data).decode() if orjson else json.dumps(_data, separators=(",", ":"))
+    )
+    # The tight budget assumes orjson; the stdlib json fallback gets the old 1ms/call
+    parse_budget_us = 100 if orjson else 1000
+
     @pytest.mark.asyncio
-    async def test_atlas_parse_response_speed(self):
+    async def test_atlas_parse_response_speed(self, atlas):
         """Test JSON parsing is fast"""
-        atlas = Atlas()
-
-        import time  # noqa: E402
-
-        large_json = '{"data": ' + str(list(range(1000))) + "}"
+        atlas._parse_response(self.large_json)  # warm-up, outside the measurement
 
-        start = time.time()
-        for _ in range(100):
-            atlas._parse_response(large_json)
-        elapsed = time.time() - start
+        # autorange() picks a loop count that runs >= 0.2s, well above timer noise
+        loops, total = timeit.Timer(lambda: atlas._parse_response(self.large_json)).autorange()
+        per_call_us = total / loops * 1e6
 
-        # Should parse 100 times in less than 0.1 seconds
-        assert elapsed < 0.1, f"Parsing too slow: {elapsed}s"
+        assert (
+            per_call_us < self.parse_budget_us
+        ), f"Parsing too slow: {per_call_us:.1f}us/call (budget {self.parse_budget_us}us)"
 
 
 if __name__ == "__main__":
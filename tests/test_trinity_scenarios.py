@@ -1,12 +1,15 @@
-import asyncio
 import os
 import sys
 import types
+from dataclasses import dataclass
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
 
+# One event loop for the whole module instead of a fresh asyncio.run() loop per scenario
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 # Ensure Copilot provider doesn't require real credentials in import-time code paths
 os.environ.setdefault("COPILOT_API_KEY", "dummy")
 
@@ -28,79 +31,10 @@ class _StubCopilotLLM:
 
 providers_copilot_mod.CopilotLLM = _StubCopilotLLM
 providers_mod.copilot = providers_copilot_mod
-sys.modules.setdefault("providers", providers_mod)
-sys.modules.setdefault("providers.copilot", providers_copilot_mod)
-
-
-# Stub langgraph.graph used during Trinity graph build
-langgraph_mod = types.ModuleType("langgraph")
-langgraph_graph_mod = types.ModuleType("langgraph.graph")
-
-
-class _StubStateGraph:
-    def __init__(self, *args, **kwargs):
-        pass
-
-    def add_node(self, *args, **kwargs):
-        return None
-
-    def set_entry_point(self, *args, **kwargs):
-        return None
-
-    def add_edge(self, *args, **kwargs):
-        return None
-
-    def add_conditional_edges(self, *args, **kwargs):
-        return None
-
-    def compile(self):
-        return SimpleNamespace()
-
-
-langgraph_graph_mod.StateGraph = _StubStateGraph
-langgraph_graph_mod.END = "__END__"
-langgraph_graph_mod.add_messages = lambda *args, **kwargs: None
-langgraph_mod.graph = langgraph_graph_mod
-sys.modules.setdefault("langgraph", langgraph_mod)
-sys.modules.setdefault("langgraph.graph", langgraph_graph_mod)
-
 
-# Stub langchain_core.messages (orchestrator imports it at module import time)
-langchain_core_mod = types.ModuleType("langchain_core")
-langchain_core_messages_mod = types.ModuleType("langchain_core.messages")
-
-
-class _BaseMessage:
-    def __init__(self, content=None, **kwargs):
-        self.content = content
-
-
-class _HumanMessage(_BaseMessage):
-    pass
-
-
-class _AIMessage(_BaseMessage):
-    pass
-
-
-class _SystemMessage(_BaseMessage):
-    pass
-
-
-langchain_core_messages_mod.BaseMessage = _BaseMessage
-langchain_core_messages_mod.HumanMessage = _HumanMessage
-langchain_core_messages_mod.AIMessage = _AIMessage
-langchain_core_messages_mod.SystemMessage = _SystemMessage
-langchain_core_mod.messages = langchain_core_messages_mod
-
-sys.modules.setdefault("langchain_core", langchain_core_mod)
-sys.modules.setdefault("langchain_core.messages", langchain_core_messages_mod)
-
-
-# Stub ukrainian_tts to avoid optional import errors during TTS calls
-sys.modules.setdefault("ukrainian_tts", types.ModuleType("ukrainian_tts"))
-sys.modules.setdefault("ukrainian_tts.tts", types.ModuleType("ukrainian_tts.tts"))
 
+# langgraph / langchain_core / ukrainian_tts are stubbed once per session by conftest.py
+# when not installed; the providers and mcp_manager stubs here only suit these tests.
 
 # Stub src.brain.mcp_manager to avoid importing MCP client stack in unit tests
 brain_mcp_manager_mod = types.ModuleType("src.brain.mcp_manager")
@@ -112,15 +46,26 @@ class _StubMCPManager:
 
 
 brain_mcp_manager_mod.mcp_manager = _StubMCPManager()
-sys.modules.setdefault("src.brain.mcp_manager", brain_mcp_manager_mod)
+
+_STUB_MODULES = {
+    "providers": providers_mod,
+    "providers.copilot": providers_copilot_mod,
+    "src.brain.mcp_manager": brain_mcp_manager_mod,
+}
 
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-
-from src.brain.agents.tetyana import StepResult  # noqa: E402
-from src.brain.orchestrator import Trinity  # noqa: E402
+# The stubs are only in sys.modules while the modules under test import them, so other
+# test modules (eg. the session `mcp` fixture) still get the real ones
+_installed = [n for n, m in _STUB_MODULES.items() if sys.modules.setdefault(n, m) is m]
+try:
+    from src.brain.agents.tetyana import StepResult  # noqa: E402
+    from src.brain.orchestrator import Trinity  # noqa: E402
+finally:
+    for _name in _installed:
+        del sys.modules[_name]
 
 
 class DummyVoice:
@@ -153,8 +98,22 @@ class StubNotifications:
         return True
 
 
+@dataclass(slots=True, frozen=True)
+class _FakePlan:
+    steps: list
+    goal: str = "Тестовий план"
+
+
+@dataclass(slots=True, frozen=True)
+class _FakeVerification:
+    verified: bool
+    description: str
+    issues: tuple
+    voice_message: str
+
+
 def _plan(steps):
-    return SimpleNamespace(steps=steps, goal="Тестовий план")
+    return _FakePlan(steps=steps)
 
 
 @pytest.fixture
@@ -195,7 +154,7 @@ def trinity_base(isolated_globals, stub_notifications, fast_sleep):
     return t
 
 
-def test_chat_intent_returns_chat_result(trinity_base):
+async def test_chat_intent_returns_chat_result(trinity_base):
     class MockAtlas:
         async def analyze_request(self, user_request: str, history=None, context=None):
             return {"intent": "chat", "initial_response": "Привіт!"}
@@ -205,13 +164,13 @@ def test_chat_intent_returns_chat_result(trinity_base):
 
     trinity_base.atlas = MockAtlas()
 
-    res = asyncio.run(trinity_base.run("привіт"))
+    res = await trinity_base.run("привіт")
     assert res["status"] == "completed"
     assert res["type"] == "chat"
     assert "Привіт" in res["result"]
 
 
-def test_planning_error_returns_error(trinity_base):
+async def test_planning_error_returns_error(trinity_base):
     class MockAtlas:
         async def analyze_request(self, user_request: str, history=None, context=None):
             return {"intent": "task", "reason": "Ок"}
@@ -221,12 +180,12 @@ def test_planning_error_returns_error(trinity_base):
 
     trinity_base.atlas = MockAtlas()
 
-    res = asyncio.run(trinity_base.run("зроби щось"))
+    res = await trinity_base.run("зроби щось")
     assert res["status"] == "error"
     assert "boom" in res["error"]
 
 
-def test_empty_plan_returns_no_steps_message(trinity_base):
+async def test_empty_plan_returns_no_steps_message(trinity_base):
     class MockAtlas:
         async def analyze_request(self, user_request: str, history=None, context=None):
             return {"intent": "task", "reason": "Ок"}
@@ -242,13 +201,13 @@ def test_empty_plan_returns_no_steps_message(trinity_base):
 
     trinity_base.atlas = MockAtlas()
 
-    res = asyncio.run(trinity_base.run("зроби план"))
+    res = await trinity_base.run("зроби план")
     assert res["status"] == "completed"
     assert res["type"] == "chat"
     assert "Не знайдено кроків" in res["result"]
 
 
-def test_simple_execution_appends_step_result(trinity_base):
+async def test_simple_execution_appends_step_result(trinity_base):
     class MockAtlas:
         async def analyze_request(self, user_request: str, history=None, context=None):
             return {"intent": "task", "reason": "Ок"}
@@ -278,14 +237,14 @@ def test_simple_execution_appends_step_result(trinity_base):
     trinity_base.atlas = MockAtlas()
     trinity_base.tetyana = MockTetyana()
 
-    res = asyncio.run(trinity_base.run("виконай"))
+    res = await trinity_base.run("виконай")
     assert res["status"] == "completed"
     assert isinstance(res["result"], list)
     assert len(res["result"]) == 1
     assert res["result"][0]["success"] is True
 
 
-def test_verification_rejection_marks_step_failed(trinity_base):
+async def test_verification_rejection_marks_step_failed(trinity_base):
     class MockAtlas:
         async def analyze_request(self, user_request: str, history=None, context=None):
             return {"intent": "task", "reason": "Ок"}
@@ -321,10 +280,10 @@ def test_verification_rejection_marks_step_failed(trinity_base):
             return ""
 
         async def verify_step(self, step, result, screenshot_path=None):
-            return SimpleNamespace(
+            return _FakeVerification(
                 verified=False,
                 description="not ok",
-                issues=["mismatch"],
+                issues=("mismatch",),
                 voice_message="Ні",
             )
 
@@ -332,14 +291,14 @@ def test_verification_rejection_marks_step_failed(trinity_base):
     trinity_base.tetyana = MockTetyana()
     trinity_base.grisha = MockGrisha()
 
-    res = asyncio.run(trinity_base.run("виконай"))
+    res = await trinity_base.run("виконай")
     assert res["status"] == "failed"
     step_results = res["result"]
     assert isinstance(step_results, list)
     assert any("Grisha rejected" in (r.get("error") or "") for r in step_results)
 
 
-def test_verification_crash_is_caught_and_logged(trinity_base):
+async def test_verification_crash_is_caught_and_logged(trinity_base):
     class MockAtlas:
         async def analyze_request(self, user_request: str, history=None, context=None):
             return {"intent": "task", "reason": "Ок"}
@@ -381,7 +340,7 @@ def test_verification_crash_is_caught_and_logged(trinity_base):
     trinity_base.tetyana = MockTetyana()
     trinity_base.grisha = MockGrisha()
 
-    res = asyncio.run(trinity_base.run("виконай"))
+    res = await trinity_base.run("виконай")
     assert res["status"] == "failed"
     step_results = res["result"]
     assert isinstance(step_results, list)
@@ -391,7 +350,7 @@ def test_verification_crash_is_caught_and_logged(trinity_base):
     assert any("Verification crashed" in str(l.get("message")) for l in logs)
 
 
-def test_retries_then_user_rejects_recovery_aborts(trinity_base, stub_notifications):
+async def test_retries_then_user_rejects_recovery_aborts(trinity_base, stub_notifications):
     stub_notifications.next_approval = False
 
     class MockAtlas:
@@ -431,14 +390,14 @@ def test_retries_then_user_rejects_recovery_aborts(trinity_base, stub_notificati
     trinity_base.atlas = MockAtlas()
     trinity_base.tetyana = MockTetyana()
 
-    res = asyncio.run(trinity_base.run("виконай"))
+    res = await trinity_base.run("виконай")
     assert res["status"] == "failed"
     assert "Task aborted" in res["error"]
     assert len(stub_notifications.stuck_alerts) == 1
     assert len(stub_notifications.approvals) == 1
 
 
-def test_subtask_step_triggers_recursive_run(trinity_base):
+async def test_subtask_step_triggers_recursive_run(trinity_base):
     class MockAtlas:
         async def analyze_request(self, user_request: str, history=None, context=None):
             if "привіт" in user_request.lower():
@@ -474,7 +433,7 @@ def test_subtask_step_triggers_recursive_run(trinity_base):
     trinity_base.atlas = MockAtlas()
     trinity_base.tetyana = MockTetyana()
 
-    res = asyncio.run(trinity_base.run("зроби підзадачу"))
+    res = await trinity_base.run("зроби підзадачу")
     assert res["status"] == "completed"
     assert isinstance(res["result"], list)
     assert len(res["result"]) == 1
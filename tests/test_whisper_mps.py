@@ -13,7 +13,6 @@ import time
 from pathlib import Path
 
 import pytest
-import torch
 
 # Add project to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -28,6 +27,8 @@ def check_mps_availability():
     print("🔍 ПЕРЕВІРКА MPS (Apple Silicon GPU)")
     print("=" * 60)
 
+    import torch  # noqa: E402
+
     if torch.backends.mps.is_available():
         print("✅ MPS доступний!")
         print(f"   PyTorch version: {torch.__version__}")
@@ -45,8 +46,12 @@ def check_mps_availability():
         return False
 
 
+@pytest.mark.usefixtures("whisper_model_preload")
 def test_whisper_device(device_name: str):
     """Тестує Whisper на вказаному device"""
+    # Imported here, not at module level: collection stays cheap where torch is absent.
+    # "mps" is only parametrized where torch reports it available (see conftest).
+    pytest.importorskip("torch")
     print(f"\n{'=' * 60}")
     print(f"🧪 ТЕСТ WHISPER НА {device_name.upper()}")
     print(f"{'=' * 60}")
@@ -56,6 +61,7 @@ def test_whisper_device(device_name: str):
 
         # Створюємо WhisperSTT з вказаним device
         print(f"Ініціалізація WhisperSTT(device='{device_name}')...")
+        # Loaded models are shared by WhisperSTT's own model cache
         stt = WhisperSTT(device=device_name)
 
         init_time = time.time() - start
@@ -91,10 +97,7 @@ def test_whisper_device(device_name: str):
 
     except Exception as e:
         print(f"\n❌ ПОМИЛКА: {e}")
-        import traceback  # noqa: E402
-
-        traceback.print_exc()
-
+        # pytest.fail reports the exception with its traceback; no need to format it twice
         pytest.fail(f"Whisper test failed on {device_name}: {e}")
 
 
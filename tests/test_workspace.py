@@ -4,30 +4,32 @@ import stat
 import sys
 from pathlib import Path
 
+import pytest
+
 # Determine CONFIG_ROOT to check creation
 CONFIG_ROOT = Path.home() / ".config" / "atlastrinity"
 WORKSPACE_DIR = CONFIG_ROOT / "workspace"
 
 # Add src to path for MCP Manager
 sys.path.append(os.path.abspath(os.getcwd()))
-from src.brain.config import ensure_dirs  # Trigger creation logic  # noqa: E402
+import src.brain.config  # noqa: E402, F401  # Importing runs ensure_dirs()
 from src.brain.mcp_manager import mcp_manager  # noqa: E402
+from src.brain.script_utils import run  # noqa: E402
 
 
-async def verify_workspace():
+async def verify_workspace(manager) -> bool:
+    """Check the workspace exists and that the filesystem MCP server can write into it."""
     print("--- 1. Testing Creation & Permissions ---")
 
-    # 1. Trigger ensure_dirs (usually happens on import of config.py, but calling explicitly to be sure)
-    ensure_dirs()
-
-    if not WORKSPACE_DIR.exists():
+    # One stat() answers both "does it exist" and "with what permissions"
+    try:
+        st = WORKSPACE_DIR.stat()
+    except FileNotFoundError:
         print(f"❌ FAILURE: Workspace directory not created at {WORKSPACE_DIR}")
-        return
-    else:
-        print(f"✅ Directory exists: {WORKSPACE_DIR}")
+        return False
+    print(f"✅ Directory exists: {WORKSPACE_DIR}")
 
     # Check permissions
-    st = os.stat(WORKSPACE_DIR)
     mode = stat.S_IMODE(st.st_mode)
     print(f"Permissions: {oct(mode)} (Expected 777 or rwxrwxrwx)")
 
@@ -41,37 +43,58 @@ async def verify_workspace():
         )
 
     print("\n--- 2. Testing MCP Write Access ---")
-    test_file = str(WORKSPACE_DIR / "mcp_test_file.txt")
+    test_file = WORKSPACE_DIR / "mcp_test_file.txt"
 
     try:
-        # We need to restart MCP server or ensure it picks up the new config
-        # Since this script imports mcp_manager fresh, it should load the new config.json
+        # The manager loaded config.json when created; re-read it only if ensure_dirs() rewrote it
         print("Connecting to filesystem...")
-        # Force reload config in manager? mcp_manager loads config in __init__
-        # We might need to re-init it or just trust it loads the file we just wrote.
-        mcp_manager.config = mcp_manager._load_config()
+        manager.reload_config_if_changed()
 
         content = "Hello from Global Workspace!"
-        result = await mcp_manager.call_tool(
-            "filesystem", "write_file", {"path": test_file, "content": content}
+        result = await manager.call_tool(
+            "filesystem", "write_file", {"path": str(test_file), "content": content}
         )
         print(f"Write Result: {result}")
 
-        if "error" not in str(result).lower() and os.path.exists(test_file):
+        try:
+            file_st = test_file.stat()
+        except FileNotFoundError:
+            file_st = None
+        if file_st is not None and "error" not in str(result).lower():
             print(f"✅ SUCCESS: MCP successfully wrote to {test_file}")
-            # Cleanup
-            os.remove(test_file)
-        else:
-            print("❌ FAILURE: MCP write failed or file not found.")
+            return True
+        print("❌ FAILURE: MCP write failed or file not found.")
 
     except Exception as e:
         print(f"❌ FAILURE: MCP interaction error: {e}")
         import traceback  # noqa: E402
 
         traceback.print_exc()
+    finally:
+        # Cleanup, whether or not the write succeeded
+        test_file.unlink(missing_ok=True)
+
+    return False
 
-    await mcp_manager.cleanup()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_workspace_writable_via_mcp(mcp):
+    """Runs on the shared session `mcp` manager; skips when the filesystem server is down."""
+    try:
+        session = await asyncio.wait_for(mcp.get_session("filesystem"), timeout=15.0)
+    except asyncio.TimeoutError:
+        session = None
+    if session is None:
+        pytest.skip("filesystem MCP server unavailable")
+    assert await verify_workspace(mcp)
+
+
+async def main():
+    try:
+        await verify_workspace(mcp_manager)
+    finally:
+        await mcp_manager.cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(verify_workspace())
+    run(main())